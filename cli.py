@@ -5,23 +5,25 @@ Modernes Click-basiertes Interface mit Rich-Output und umfassenden Features
 """
 
 import asyncio
-import json
+import functools
+import importlib.util
+import os
+import re
+import shutil
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import click
-import structlog
+import orjson
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.table import Table
-from rich.text import Text
 
-# Unsere Module
-from video_downloader import WebVideoDownloader
+# Unsere Module (video_downloader zieht Playwright/yt-dlp nach und wird lazy importiert)
 from utilities import (
-    VideoAnalyzer, PerformanceMonitor, DownloadHistory,
+    VideoAnalyzer, DownloadHistory,
     RichDisplay, setup_structured_logging
 )
 
@@ -34,11 +36,97 @@ class CLIContext:
         self.config_path = "config.json"
         self.verbose = False
         self.quiet = False
+    
+    @functools.cached_property
+    def analyzer(self) -> VideoAnalyzer:
+        return VideoAnalyzer()
+    
+    @functools.cached_property
+    def history(self) -> DownloadHistory:
+        return DownloadHistory()
+    
+    @functools.cached_property
+    def display(self) -> RichDisplay:
+        # Gleiche Console wie die Befehle, damit Ausgaben nicht durcheinander geraten
+        return RichDisplay(console=self.console)
 
 
 # Global Context für Click
 pass_context = click.make_pass_decorator(CLIContext, ensure=True)
 
+# URLs pro batch_analyze-Aufruf im analyze-Befehl
+ANALYZE_CHUNK_SIZE = 16
+
+# Gültige Eingaben für die interaktive URL-Erfassung
+URL_PATTERN = re.compile(r'https?://')
+
+
+def read_json(path) -> Any:
+    """Liest JSON-Datei mit orjson"""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def write_json(path, data: Any):
+    """Schreibt Daten als eingerücktes UTF-8-JSON mit orjson"""
+    Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+@functools.lru_cache(maxsize=None)
+def config_adapter():
+    """Einmalig aufgebauter Pydantic-Validator für GlobalConfig"""
+    from pydantic import TypeAdapter
+    from video_downloader import GlobalConfig
+    
+    return TypeAdapter(GlobalConfig)
+
+
+def write_analysis_export(path, analyses: List[dict], report: Dict[str, Any]):
+    """Schreibt Analyse-Export inkrementell, eine Analyse pro Zeile"""
+    with open(path, 'wb') as f:
+        f.write(b'{"analyses": [\n')
+        for i, analysis in enumerate(analyses):
+            if i:
+                f.write(b',\n')
+            f.write(orjson.dumps(analysis, option=orjson.OPT_NON_STR_KEYS))
+        f.write(b'\n],\n"report": ')
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        f.write(b',\n"timestamp": ')
+        f.write(orjson.dumps(datetime.now().isoformat()))
+        f.write(b'}\n')
+
+
+def echo_json(data: Any):
+    """Gibt Daten als kompaktes JSON auf stdout aus (für --quiet)"""
+    click.echo(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode())
+
+
+@functools.lru_cache(maxsize=None)
+def configure_logging(verbose: bool, quiet: bool):
+    """Richtet structlog einmal pro Prozess und Log-Level ein"""
+    log_level = "DEBUG" if verbose else "ERROR" if quiet else "INFO"
+    setup_structured_logging(log_level)
+
+
+def _eager_event_loop() -> asyncio.AbstractEventLoop:
+    """Neuer Event-Loop mit Eager Task Factory (Python 3.12+)"""
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(asyncio.eager_task_factory)
+    return loop
+
+
+def run_async(coro):
+    """Führt Coroutine aus, ab Python 3.12 mit Eager Task Factory"""
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    
+    if sys.version_info < (3, 12):
+        return asyncio.run(coro)
+    
+    # Kurze Tasks laufen bis zum ersten await direkt, ohne Umweg über call_soon;
+    # Runner räumt wie asyncio.run offene Tasks und den Default-Executor auf
+    with asyncio.Runner(loop_factory=_eager_event_loop) as runner:
+        return runner.run(coro)
+
 
 @click.group()
 @click.option('--config', '-c', default='config.json', 
@@ -61,8 +149,7 @@ def cli(ctx: CLIContext, config: str, verbose: bool, quiet: bool):
     ctx.quiet = quiet
     
     # Logging konfigurieren
-    log_level = "DEBUG" if verbose else "ERROR" if quiet else "INFO"
-    setup_structured_logging(log_level)
+    configure_logging(verbose, quiet)
 
 
 @cli.command()
@@ -93,10 +180,30 @@ def download(ctx: CLIContext, urls: tuple, output: str, no_vpn: bool,
       video-dl download --analyze-only https://unknown-site.com/video
     """
     
+    def _build_config() -> dict:
+        # Download-Konfiguration anpassen
+        try:
+            config = read_json(ctx.config_path)
+        except FileNotFoundError:
+            config = {}
+        
+        # CLI-Optionen überschreiben Config
+        config.update({
+            'output_directory': output,
+            'nordvpn_enabled': not no_vpn,
+            'headless': headless,
+            'concurrent_downloads': concurrent,
+            'retry_attempts': retry
+        })
+        return config
+    
     async def _download():
+        from rich.table import Table
+        from video_downloader import WebVideoDownloader
+        
         # URL-Analyse zuerst
-        analyzer = VideoAnalyzer()
-        display = RichDisplay()
+        analyzer = ctx.analyzer
+        display = ctx.display
         
         ctx.console.print(Panel(
             f"🔍 Analysiere {len(urls)} URL(s)...",
@@ -104,7 +211,15 @@ def download(ctx: CLIContext, urls: tuple, output: str, no_vpn: bool,
             style="cyan"
         ))
         
-        analyses = analyzer.batch_analyze(list(urls))
+        # Analyse und Config-Laden laufen parallel in Threads
+        if analyze_only:
+            analyses = await asyncio.to_thread(analyzer.batch_analyze, list(urls))
+            config = None
+        else:
+            analyses, config = await asyncio.gather(
+                asyncio.to_thread(analyzer.batch_analyze, list(urls)),
+                asyncio.to_thread(_build_config)
+            )
         display.display_analysis_results(analyses)
         
         report = analyzer.generate_analysis_report(analyses)
@@ -114,74 +229,58 @@ def download(ctx: CLIContext, urls: tuple, output: str, no_vpn: bool,
             ctx.console.print("\n[yellow]🔍 Nur Analyse durchgeführt (--analyze-only)[/yellow]")
             return
         
-        # Download-Konfiguration anpassen
-        config_path = Path(ctx.config_path)
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-        else:
-            config = {}
+        # Downloads ausführen
+        ctx.console.print(Panel(
+            f"🚀 Starte Download von {len(urls)} Video(s)...",
+            title="Download",
+            style="green"
+        ))
         
-        # CLI-Optionen überschreiben Config
-        config.update({
-            'output_directory': output,
-            'nordvpn_enabled': not no_vpn,
-            'headless': headless,
-            'concurrent_downloads': concurrent,
-            'retry_attempts': retry
-        })
+        # Zusammengeführte Config direkt übergeben, ohne temporäre Datei
+        async with WebVideoDownloader(config) as downloader:
+            results = await downloader.download_multiple_urls(list(urls))
         
-        # Temporäre Config speichern
-        temp_config = Path('.temp_config.json')
-        with open(temp_config, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
+        # Historie gesammelt in einer Transaktion schreiben
+        await asyncio.to_thread(ctx.history.add_many, [
+            {
+                'url': result.url,
+                'success': result.success,
+                'title': result.video_info.title if result.video_info else None,
+                'filepath': str(result.filepath) if result.filepath else None,
+                'download_time': result.download_time,
+                'error_message': result.error if not result.success else None
+            }
+            for result in results
+        ])
         
-        try:
-            # Downloads ausführen
-            ctx.console.print(Panel(
-                f"🚀 Starte Download von {len(urls)} Video(s)...",
-                title="Download",
-                style="green"
-            ))
-            
-            async with WebVideoDownloader(str(temp_config)) as downloader:
-                results = await downloader.download_multiple_urls(list(urls))
+        # Ergebnisse anzeigen
+        display.display_progress_summary(results)
+        
+        # Detaillierte Ergebnisse bei Verbose
+        if ctx.verbose:
+            table = Table(title="Detaillierte Ergebnisse")
+            table.add_column("URL", style="cyan", max_width=50)
+            table.add_column("Status", style="green")
+            table.add_column("Datei", style="blue")
+            table.add_column("Zeit", style="yellow")
             
-            # Ergebnisse anzeigen
-            display.display_progress_summary(results)
+            # Alle Zeilen in einem Durchgang vorberechnen
+            rows = [
+                (
+                    result.url if len(result.url) <= 50 else result.url[:47] + "...",
+                    "✅ Erfolg" if result.success else "❌ Fehler",
+                    result.filepath.name if result.filepath else "N/A",
+                    f"{result.download_time:.2f}s" if result.download_time else "N/A"
+                )
+                for result in results
+            ]
+            for row in rows:
+                table.add_row(*row)
             
-            # Detaillierte Ergebnisse bei Verbose
-            if ctx.verbose:
-                table = Table(title="Detaillierte Ergebnisse")
-                table.add_column("URL", style="cyan", max_width=50)
-                table.add_column("Status", style="green")
-                table.add_column("Datei", style="blue")
-                table.add_column("Zeit", style="yellow")
-                
-                for result in results:
-                    status = "✅ Erfolg" if result.success else "❌ Fehler"
-                    filepath = str(result.filepath.name) if result.filepath else "N/A"
-                    time_str = f"{result.download_time:.2f}s" if result.download_time else "N/A"
-                    
-                    table.add_row(
-                        result.url[:47] + "..." if len(result.url) > 50 else result.url,
-                        status,
-                        filepath,
-                        time_str
-                    )
-                
-                ctx.console.print(table)
-        
-        finally:
-            # Temporäre Config löschen
-            if temp_config.exists():
-                temp_config.unlink()
+            ctx.console.print(table)
     
     # Async ausführen
-    if sys.platform == 'win32':
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-    
-    asyncio.run(_download())
+    run_async(_download())
 
 
 @cli.command()
@@ -197,29 +296,35 @@ def stats(ctx: CLIContext, days: int, export: Optional[str]):
     Zeigt detaillierte Statistiken über vergangene Downloads,
     Erfolgsraten, Top-Domains und häufige Fehler.
     """
-    history = DownloadHistory()
-    display = RichDisplay()
+    history = ctx.history
+    display = ctx.display
     
-    ctx.console.print(Panel(
-        f"📈 Lade Statistiken der letzten {days} Tage...",
-        title="Statistiken",
-        style="blue"
-    ))
+    if not ctx.quiet:
+        ctx.console.print(Panel(
+            f"📈 Lade Statistiken der letzten {days} Tage...",
+            title="Statistiken",
+            style="blue"
+        ))
     
     stats_data = history.get_download_stats(days=days)
     
     if not stats_data:
-        ctx.console.print("[yellow]📭 Keine Download-Historie gefunden[/yellow]")
+        if not ctx.quiet:
+            ctx.console.print("[yellow]📭 Keine Download-Historie gefunden[/yellow]")
         return
     
-    display.display_download_stats(stats_data)
+    # Bei --quiet nur kompaktes JSON ohne Rich-Rendering
+    if ctx.quiet:
+        echo_json(stats_data)
+    else:
+        display.display_download_stats(stats_data)
     
     # Export falls angefordert
     if export:
         export_path = Path(export)
-        with open(export_path, 'w', encoding='utf-8') as f:
-            json.dump(stats_data, f, indent=2, ensure_ascii=False)
-        ctx.console.print(f"[green]💾 Statistiken exportiert nach: {export_path}[/green]")
+        write_json(export_path, stats_data)
+        if not ctx.quiet:
+            ctx.console.print(f"[green]💾 Statistiken exportiert nach: {export_path}[/green]")
 
 
 @cli.command()
@@ -228,8 +333,11 @@ def stats(ctx: CLIContext, days: int, export: Optional[str]):
               help='Detaillierte Analyse mit Extraktions-Strategien')
 @click.option('--json-output', '-j',
               help='Ergebnisse als JSON speichern')
+@click.option('--concurrent', default=10,
+              help='Anzahl paralleler Analysen')
 @pass_context
-def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[str]):
+def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[str],
+            concurrent: int):
     """
     🔍 URLs analysieren ohne Download
     
@@ -238,31 +346,76 @@ def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[
     
     URLS: URLs zum Analysieren (falls leer: interaktive Eingabe)
     """
+    from rich.console import Group
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    from rich.table import Table
+    
     if not urls:
+        try:
+            import readline  # noqa: F401 - Zeilenbearbeitung/History für input()
+        except ImportError:
+            pass
+        
         ctx.console.print("[blue]📝 Geben Sie URLs ein (eine pro Zeile, leere Zeile zum Beenden):[/blue]")
-        url_list = []
+        raw_lines = []
         try:
             while True:
-                url = input("URL: ").strip()
-                if not url:
+                line = input("URL: ").strip()
+                if not line:
                     break
-                if url.startswith(('http://', 'https://')):
-                    url_list.append(url)
-                    ctx.console.print(f"[green]✅ {url}[/green]")
-                else:
-                    ctx.console.print("[red]❌ Ungültige URL[/red]")
+                raw_lines.append(line)
+        except EOFError:
+            pass
         except KeyboardInterrupt:
             ctx.console.print("\n[yellow]Abgebrochen[/yellow]")
             return
         
+        # Eingaben in einem Durchgang prüfen und gesammelt ausgeben
+        url_list = []
+        if raw_lines:
+            input_table = Table(title="Eingegebene URLs")
+            input_table.add_column("URL", style="cyan")
+            input_table.add_column("Status")
+            
+            for line in raw_lines:
+                if URL_PATTERN.match(line):
+                    url_list.append(line)
+                    input_table.add_row(line, "[green]✅[/green]")
+                else:
+                    input_table.add_row(line, "[red]❌ Ungültige URL[/red]")
+            
+            ctx.console.print(input_table)
+        
         urls = tuple(url_list)
     
     if not urls:
         ctx.console.print("[red]❌ Keine URLs zum Analysieren[/red]")
         return
     
-    analyzer = VideoAnalyzer()
-    display = RichDisplay()
+    analyzer = ctx.analyzer
+    display = ctx.display
+    
+    async def _analyze(progress: Progress, task) -> List[dict]:
+        # Chunks über batch_analyze, begrenzte Parallelität, Reihenfolge bleibt erhalten
+        semaphore = asyncio.Semaphore(max(1, concurrent))
+        url_list = list(urls)
+        chunks = [url_list[i:i + ANALYZE_CHUNK_SIZE]
+                  for i in range(0, len(url_list), ANALYZE_CHUNK_SIZE)]
+        
+        async def _analyze_chunk(chunk: List[str]) -> List[dict]:
+            async with semaphore:
+                chunk_analyses = await asyncio.to_thread(analyzer.batch_analyze, chunk)
+            progress.advance(task, advance=len(chunk))
+            return chunk_analyses
+        
+        if sys.version_info >= (3, 11):
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(_analyze_chunk(chunk)) for chunk in chunks]
+            results = [t.result() for t in tasks]
+        else:
+            results = await asyncio.gather(*(_analyze_chunk(chunk) for chunk in chunks))
+        
+        return [analysis for chunk_analyses in results for analysis in chunk_analyses]
     
     with Progress(
         SpinnerColumn(),
@@ -271,12 +424,7 @@ def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[
         transient=True
     ) as progress:
         task = progress.add_task("Analysiere URLs...", total=len(urls))
-        
-        analyses = []
-        for url in urls:
-            analysis = analyzer.analyze_url(url)
-            analyses.append(analysis)
-            progress.advance(task)
+        analyses = run_async(_analyze(progress, task))
     
     # Ergebnisse anzeigen
     display.display_analysis_results(analyses)
@@ -293,7 +441,7 @@ def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[
     summary_table.add_row("Streaming-Plattformen", str(report['streaming_platforms']))
     summary_table.add_row("Erfolgswahrscheinlichkeit", f"{report['success_probability']:.1%}")
     
-    ctx.console.print(summary_table)
+    renderables = [summary_table]
     
     # Detaillierte Analyse
     if detailed:
@@ -304,18 +452,14 @@ def analyze(ctx: CLIContext, urls: tuple, detailed: bool, json_output: Optional[
         for complexity, count in report['complexity_distribution'].items():
             complexity_table.add_row(complexity.title(), str(count))
         
-        ctx.console.print(complexity_table)
+        renderables.append(complexity_table)
+    
+    # Alle Tabellen in einem Render-Durchgang ausgeben
+    ctx.console.print(Group(*renderables))
     
     # JSON-Export
     if json_output:
-        export_data = {
-            'analyses': analyses,
-            'report': report,
-            'timestamp': str(asyncio.get_event_loop().time())
-        }
-        
-        with open(json_output, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        write_analysis_export(json_output, analyses, report)
         
         ctx.console.print(f"[green]💾 Analyse exportiert nach: {json_output}[/green]")
 
@@ -359,8 +503,7 @@ def config(ctx: CLIContext, create_example: bool, validate: bool, show: bool):
             "log_level": "INFO"
         }
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(example_config, f, indent=2, ensure_ascii=False)
+        write_json(config_path, example_config)
         
         ctx.console.print(f"[green]✅ Beispiel-Konfiguration erstellt: {config_path}[/green]")
         return
@@ -372,9 +515,8 @@ def config(ctx: CLIContext, create_example: bool, validate: bool, show: bool):
     
     # Konfiguration laden
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-    except json.JSONDecodeError as e:
+        config_data = read_json(config_path)
+    except orjson.JSONDecodeError as e:
         ctx.console.print(f"[red]❌ Ungültiges JSON in Konfiguration: {e}[/red]")
         return
     except Exception as e:
@@ -384,14 +526,19 @@ def config(ctx: CLIContext, create_example: bool, validate: bool, show: bool):
     if validate:
         # Validierung mit Pydantic-Modell
         try:
-            from video_downloader import GlobalConfig
-            GlobalConfig(**config_data)
+            config_adapter().validate_python(config_data)
             ctx.console.print("[green]✅ Konfiguration ist gültig[/green]")
         except Exception as e:
             ctx.console.print(f"[red]❌ Konfigurationsfehler: {e}[/red]")
         return
     
     if show:
+        if ctx.quiet:
+            echo_json(config_data)
+            return
+        
+        from rich.table import Table
+        
         # Konfiguration anzeigen
         table = Table(title="Aktuelle Konfiguration")
         table.add_column("Einstellung", style="cyan")
@@ -443,7 +590,7 @@ def cleanup(ctx: CLIContext, days: int, confirm: bool):
     
     Löscht alte Einträge aus der Download-Historie-Datenbank.
     """
-    history = DownloadHistory()
+    history = ctx.history
     
     if not confirm:
         response = click.confirm(f"Wirklich alle Einträge älter als {days} Tage löschen?")
@@ -457,19 +604,102 @@ def cleanup(ctx: CLIContext, days: int, confirm: bool):
     ctx.console.print(f"[green]✅ Historie bereinigt (Einträge älter als {days} Tage entfernt)[/green]")
 
 
+# Cache für Doctor-Checks (Versionsabfragen ändern sich nur bei Neuinstallation)
+DOCTOR_CACHE_PATH = Path.home() / ".cache" / "video-dl" / "doctor.json"
+DOCTOR_CACHE_TTL = 3600
+
+
+def _file_mtime_ns(path: Optional[str]) -> Optional[int]:
+    """Liefert mtime einer Datei in Nanosekunden oder None"""
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _module_key(module_name: str) -> Optional[int]:
+    """Cache-Key für Python-Paket, ohne das Paket zu importieren"""
+    spec = importlib.util.find_spec(module_name)
+    return _file_mtime_ns(spec.origin if spec else None)
+
+
+def _binary_key(binary: str) -> Optional[int]:
+    """Cache-Key für externes Programm im PATH"""
+    return _file_mtime_ns(shutil.which(binary))
+
+
+def _load_doctor_cache() -> Dict[str, Any]:
+    """Lädt gecachte Doctor-Ergebnisse, bei Fehlern leerer Cache"""
+    try:
+        return orjson.loads(DOCTOR_CACHE_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+
+def _save_doctor_cache(cache: Dict[str, Any]):
+    """Speichert Doctor-Ergebnisse, Fehler werden ignoriert"""
+    try:
+        DOCTOR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        DOCTOR_CACHE_PATH.write_bytes(orjson.dumps(cache))
+    except OSError:
+        pass
+
+
+async def _cached_check(cache: Dict[str, Any], name: str, key: Optional[int],
+                        probe: Callable[[], Awaitable[Tuple[str, bool]]],
+                        ttl: int = DOCTOR_CACHE_TTL) -> Tuple[str, str, bool]:
+    """Liefert (Komponente, Version, OK) aus dem Cache oder führt die Prüfung aus"""
+    entry = cache.get(name)
+    if entry and entry.get('key') == key and time.time() - entry.get('checked_at', 0) < ttl:
+        return name, entry['version'], entry['ok']
+    
+    version, ok = await probe()
+    cache[name] = {'key': key, 'checked_at': time.time(), 'version': version, 'ok': ok}
+    return name, version, ok
+
+
+async def _probe_binary(argv: List[str], missing: str,
+                        parse: Callable[[str], str]) -> Tuple[str, bool]:
+    """Führt Versionsabfrage eines externen Programms asynchron aus"""
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+    except FileNotFoundError:
+        return missing, False
+    
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return missing, False
+    
+    if proc.returncode != 0:
+        return "Fehler", False
+    return parse(stdout.decode(errors='replace')), True
+
+
 @cli.command()
+@click.option('--refresh', is_flag=True,
+              help='Gecachte Prüfergebnisse ignorieren und neu prüfen')
 @pass_context  
-def doctor(ctx: CLIContext):
+def doctor(ctx: CLIContext, refresh: bool):
     """
     🏥 System-Diagnose durchführen
     
     Überprüft Installation, Dependencies und Konfiguration.
     """
-    ctx.console.print(Panel(
-        "🔍 Führe System-Diagnose durch...",
-        title="System-Check",
-        style="blue"
-    ))
+    if not ctx.quiet:
+        ctx.console.print(Panel(
+            "🔍 Führe System-Diagnose durch...",
+            title="System-Check",
+            style="blue"
+        ))
     
     checks = []
     
@@ -479,44 +709,40 @@ def doctor(ctx: CLIContext):
     checks.append(("Python Version", python_version, python_ok))
     
     # Dependencies prüfen
-    try:
-        import playwright
-        playwright_ok = True
-        playwright_version = playwright.__version__
-    except ImportError:
-        playwright_ok = False
-        playwright_version = "Nicht installiert"
-    checks.append(("Playwright", playwright_version, playwright_ok))
+    async def _probe_playwright() -> Tuple[str, bool]:
+        try:
+            import playwright
+            return playwright.__version__, True
+        except ImportError:
+            return "Nicht installiert", False
     
-    try:
-        import yt_dlp
-        ytdlp_ok = True
-        ytdlp_version = yt_dlp.version.__version__
-    except ImportError:
-        ytdlp_ok = False
-        ytdlp_version = "Nicht installiert"
-    checks.append(("yt-dlp", ytdlp_version, ytdlp_ok))
-    
-    # FFmpeg prüfen
-    import subprocess
-    try:
-        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True, timeout=5)
-        ffmpeg_ok = result.returncode == 0
-        ffmpeg_version = result.stdout.split('\n')[0] if ffmpeg_ok else "Fehler"
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        ffmpeg_ok = False
-        ffmpeg_version = "Nicht gefunden"
-    checks.append(("FFmpeg", ffmpeg_version, ffmpeg_ok))
-    
-    # NordVPN prüfen
-    try:
-        result = subprocess.run(['nordvpn', '--version'], capture_output=True, text=True, timeout=5)
-        nordvpn_ok = result.returncode == 0
-        nordvpn_version = result.stdout.strip() if nordvpn_ok else "Fehler"
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        nordvpn_ok = False
-        nordvpn_version = "Nicht installiert"
-    checks.append(("NordVPN CLI", nordvpn_version, nordvpn_ok))
+    async def _probe_ytdlp() -> Tuple[str, bool]:
+        try:
+            import yt_dlp
+            return yt_dlp.version.__version__, True
+        except ImportError:
+            return "Nicht installiert", False
+    
+    async def _probe_ffmpeg() -> Tuple[str, bool]:
+        return await _probe_binary(['ffmpeg', '-version'], "Nicht gefunden",
+                                   lambda out: out.split('\n')[0])
+    
+    async def _probe_nordvpn() -> Tuple[str, bool]:
+        return await _probe_binary(['nordvpn', '--version'], "Nicht installiert",
+                                   lambda out: out.strip())
+    
+    async def _run_checks(cache: Dict[str, Any]) -> List[Tuple[str, str, bool]]:
+        # Externe Programme laufen parallel, Gesamtzeit = langsamste Prüfung
+        return list(await asyncio.gather(
+            _cached_check(cache, "Playwright", _module_key('playwright'), _probe_playwright),
+            _cached_check(cache, "yt-dlp", _module_key('yt_dlp'), _probe_ytdlp),
+            _cached_check(cache, "FFmpeg", _binary_key('ffmpeg'), _probe_ffmpeg),
+            _cached_check(cache, "NordVPN CLI", _binary_key('nordvpn'), _probe_nordvpn),
+        ))
+    
+    cache = {} if refresh else _load_doctor_cache()
+    checks.extend(run_async(_run_checks(cache)))
+    _save_doctor_cache(cache)
     
     # Konfiguration prüfen
     config_path = Path(ctx.config_path)
@@ -525,6 +751,15 @@ def doctor(ctx: CLIContext):
     checks.append(("Konfiguration", config_status, config_ok))
     
     # Ergebnisse anzeigen
+    if ctx.quiet:
+        echo_json([
+            {'component': component, 'version': version, 'ok': ok}
+            for component, version, ok in checks
+        ])
+        return
+    
+    from rich.table import Table
+    
     table = Table(title="System-Diagnose")
     table.add_column("Komponente", style="cyan")
     table.add_column("Status", style="white")
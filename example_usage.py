@@ -6,23 +6,60 @@ Performance-Monitoring, Analyse-Tools und erweiterte Funktionen
 """
 
 import asyncio
-import json
+import random
 import sys
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import aiohttp
+import orjson
 
 from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
 # Import unserer Module
-from video_downloader import WebVideoDownloader
+from video_downloader import (
+    DownloadResult, WebVideoDownloader, _atomic_write_bytes, load_config
+)
 from utilities import (
     VideoAnalyzer, PerformanceMonitor, DownloadHistory,
     RichDisplay, ErrorRecovery, setup_structured_logging
 )
 
 
+URL_PREFIXES = ('http://', 'https://')
+
+BANNER_TEXT = """
+╔══════════════════════════════════════════════════════════════╗
+║                   WEB VIDEO DOWNLOADER                      ║
+║                    Advanced Demo Script                     ║
+║                                                              ║
+║  Features:                                                   ║
+║  • NordVPN Integration mit IP-Rotation                      ║
+║  • Browser-Automatisierung (Playwright)                    ║
+║  • yt-dlp für beste Video-Qualität                         ║
+║  • Performance-Monitoring                                   ║
+║  • Download-Historie & Statistiken                         ║
+║  • Intelligente Fehlerbehandlung                           ║
+║                                                              ║
+╚══════════════════════════════════════════════════════════════╝
+        """
+
+
+@lru_cache(maxsize=None)
+def _get_banner():
+    """Erstellt das Banner-Panel einmalig"""
+    from rich.panel import Panel
+    
+    return Panel(BANNER_TEXT, style="cyan")
+
+
+def filter_urls(lines: List[str]) -> List[str]:
+    """Filtert gültige URLs aus einer Liste von Eingabezeilen"""
+    return [url for url in map(str.strip, lines) if url.startswith(URL_PREFIXES)]
+
+
 class VideoDownloaderDemo:
     """Demo-Klasse für umfassende Video-Downloader-Funktionalität"""
     
@@ -34,27 +71,28 @@ class VideoDownloaderDemo:
         self.download_history = DownloadHistory()
         self.error_recovery = ErrorRecovery()
         
+        # Geteilte HTTP-Session, wird in __aenter__ erstellt
+        self._session: Optional[aiohttp.ClientSession] = None
+        
         # Setup strukturiertes Logging
         setup_structured_logging("INFO")
     
+    async def __aenter__(self):
+        """Erstellt eine HTTP-Session für die gesamte Demo-Laufzeit"""
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=75)
+        )
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Schließt die geteilte HTTP-Session"""
+        if self._session:
+            await self._session.close()
+            self._session = None
+    
     def print_banner(self):
         """Zeigt Banner mit Programm-Info"""
-        banner = """
-╔══════════════════════════════════════════════════════════════╗
-║                   WEB VIDEO DOWNLOADER                      ║
-║                    Advanced Demo Script                     ║
-║                                                              ║
-║  Features:                                                   ║
-║  • NordVPN Integration mit IP-Rotation                      ║
-║  • Browser-Automatisierung (Playwright)                    ║
-║  • yt-dlp für beste Video-Qualität                         ║
-║  • Performance-Monitoring                                   ║
-║  • Download-Historie & Statistiken                         ║
-║  • Intelligente Fehlerbehandlung                           ║
-║                                                              ║
-╚══════════════════════════════════════════════════════════════╝
-        """
-        self.console.print(Panel(banner, style="cyan"))
+        self.console.print(_get_banner())
     
     async def demo_url_analysis(self, urls: List[str]):
         """Demonstriert URL-Analyse-Features"""
@@ -92,12 +130,17 @@ class VideoDownloaderDemo:
     
     async def demo_download_with_monitoring(self, urls: List[str], config_path: str):
         """Führt Downloads mit umfassendem Monitoring durch"""
-        self.console.print("\n[bold yellow]🚀 DOWNLOAD MIT MONITORING[/bold yellow]")
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         
-        results = []
+        self.console.print("\n[bold yellow]🚀 DOWNLOAD MIT MONITORING[/bold yellow]")
         
         # Downloader mit Context Manager
-        async with WebVideoDownloader(config_path) as downloader:
+        async with WebVideoDownloader(config_path, session=self._session) as downloader:
+            
+            semaphore = asyncio.Semaphore(max(1, downloader.config.concurrent_downloads))
+            active_downloads = 0
+            completed = 0
+            pending_history = []
             
             with Progress(
                 SpinnerColumn(),
@@ -105,53 +148,84 @@ class VideoDownloaderDemo:
                 console=self.console
             ) as progress:
                 
-                # Für jede URL einzeln verarbeiten (für besseres Monitoring)
-                for i, url in enumerate(urls, 1):
-                    task = progress.add_task(f"Download {i}/{len(urls)}: {url[:50]}...", total=1)
-                    
-                    # Performance vor Download
-                    pre_metrics = self.performance_monitor.capture_metrics(active_downloads=1)
+                task = progress.add_task(f"Downloads (0/{len(urls)})", total=len(urls))
+                
+                async def _download_one(url: str):
+                    nonlocal active_downloads, completed
                     
-                    try:
-                        # Download ausführen
-                        result = await downloader.process_single_url(url)
-                        results.append(result)
-                        
-                        # Performance nach Download
-                        post_metrics = self.performance_monitor.capture_metrics(active_downloads=0)
+                    async with semaphore:
+                        active_downloads += 1
                         
-                        # In Historie speichern
-                        self.download_history.add_download(
-                            url=url,
-                            success=result.success,
-                            title=result.video_info.title if result.video_info else None,
-                            filepath=str(result.filepath) if result.filepath else None,
-                            download_time=result.download_time,
-                            error_message=result.error if not result.success else None,
-                            ip_address=await downloader.vpn_manager.get_current_ip()
-                        )
-                        
-                        # Status anzeigen
-                        if result.success:
-                            self.console.print(f"  ✅ [green]{url}[/green] - {result.download_time:.2f}s")
-                        else:
-                            self.console.print(f"  ❌ [red]{url}[/red] - {result.error}")
+                        try:
+                            # Download ausführen
+                            result = await downloader.process_single_url(url)
+                            
+                            # Für die Historie vormerken, geschrieben wird gesammelt
+                            pending_history.append({
+                                'url': url,
+                                'success': result.success,
+                                'title': result.video_info.title if result.video_info else None,
+                                'filepath': str(result.filepath) if result.filepath else None,
+                                'download_time': result.download_time,
+                                'error_message': result.error if not result.success else None,
+                                'ip_address': await downloader.vpn_manager.get_current_ip()
+                            })
                             
-                            # Fehleranalyse und Recovery-Vorschlag
-                            error_category = self.error_recovery.categorize_error(result.error or "")
-                            recovery_action = self.error_recovery.suggest_recovery_action(error_category, 1)
-                            self.console.print(f"     💡 Vorschlag: {recovery_action.get('action', 'Manual intervention')}")
+                            # Status anzeigen
+                            if result.success:
+                                self.console.print(f"  ✅ [green]{url}[/green] - {result.download_time:.2f}s")
+                            else:
+                                self.console.print(f"  ❌ [red]{url}[/red] - {result.error}")
+                                
+                                # Fehleranalyse und Recovery-Vorschlag
+                                error_category = self.error_recovery.categorize_error(result.error or "")
+                                recovery_action = self.error_recovery.suggest_recovery_action(error_category, 1)
+                                self.console.print(f"     💡 Vorschlag: {recovery_action.get('action', 'Manual intervention')}")
+                            
+                        except Exception as e:
+                            self.console.print(f"  💥 [red]Unerwarteter Fehler bei {url}: {e}[/red]")
+                            result = DownloadResult(url=url, success=False, error=str(e))
+                        
+                        finally:
+                            active_downloads -= 1
+                            completed += 1
+                            progress.update(task, advance=1, description=f"Downloads ({completed}/{len(urls)})")
                         
-                    except Exception as e:
-                        self.console.print(f"  💥 [red]Unerwarteter Fehler bei {url}: {e}[/red]")
-                        results.append(type('Result', (), {'url': url, 'success': False, 'error': str(e)})())
+                        # Kurze, zufällige Pause pro Slot für realistisches Verhalten
+                        await asyncio.sleep(random.uniform(0.5, 2.0))
                     
-                    progress.update(task, completed=1)
+                    return result
+                
+                # Metriken im Hintergrund statt vor/nach jedem Download erfassen
+                batch_start = datetime.now()
+                self.performance_monitor.start_background(
+                    interval=0.5, active_downloads=lambda: active_downloads
+                )
+                
+                try:
+                    # Alle URLs parallel, begrenzt durch concurrent_downloads
+                    results = await asyncio.gather(
+                        *(_download_one(url) for url in urls),
+                        return_exceptions=True
+                    )
+                finally:
+                    await self.performance_monitor.stop_background()
                     
-                    # Kurze Pause zwischen Downloads für realistisches Verhalten
-                    await asyncio.sleep(2)
+                    # Historie in einer Transaktion schreiben
+                    self.download_history.add_many(pending_history)
         
-        return results
+        window = self.performance_monitor.get_window_metrics(batch_start, datetime.now())
+        if window:
+            self.console.print(
+                f"[blue]⚡ Ø CPU während Downloads: {window['avg_cpu_percent']:.1f}% | "
+                f"Ø RAM: {window['avg_memory_mb']:.1f} MB[/blue]"
+            )
+        
+        return [
+            DownloadResult(url=url, success=False, error=str(result))
+            if isinstance(result, BaseException) else result
+            for url, result in zip(urls, results)
+        ]
     
     async def demo_statistics_and_history(self):
         """Zeigt Download-Statistiken und Historie"""
@@ -176,8 +250,7 @@ class VideoDownloaderDemo:
         
         config_file = Path(config_path)
         if config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = load_config(config_file)
             
             self.console.print(f"[green]📝 Konfiguration geladen aus: {config_path}[/green]")
             self.console.print(f"  • Konfigurierte Sites: {len(config.get('sites', {}))}")
@@ -197,8 +270,7 @@ class VideoDownloaderDemo:
                 }
                 config['sites'].update(example_site)
                 
-                with open(config_file, 'w', encoding='utf-8') as f:
-                    json.dump(config, f, indent=2, ensure_ascii=False)
+                _atomic_write_bytes(config_file, orjson.dumps(config, option=orjson.OPT_INDENT_2))
                 
                 self.console.print("[blue]➕ Beispiel-Site-Konfiguration hinzugefügt[/blue]")
         else:
@@ -215,6 +287,13 @@ class VideoDownloaderDemo:
     async def interactive_mode(self):
         """Interaktiver Modus für Benutzer-Input"""
         self.console.print("\n[bold yellow]🎛️ INTERAKTIVER MODUS[/bold yellow]")
+        
+        # Umgeleitete Eingabe (Pipe/Datei) in einem Block lesen
+        if not sys.stdin.isatty():
+            urls = filter_urls(sys.stdin.read().splitlines())
+            self.console.print(f"[green]✅ {len(urls)} URLs von stdin gelesen[/green]")
+            return urls
+        
         self.console.print("Geben Sie URLs ein (eine pro Zeile, leere Zeile zum Beenden):")
         
         urls = []
@@ -223,7 +302,7 @@ class VideoDownloaderDemo:
                 url = input("URL: ").strip()
                 if not url:
                     break
-                if url.startswith(('http://', 'https://')):
+                if url.startswith(URL_PREFIXES):
                     urls.append(url)
                     self.console.print(f"[green]✅ Hinzugefügt: {url}[/green]")
                 else:
@@ -290,32 +369,40 @@ async def main():
                        help='Interaktiver Modus für URL-Eingabe')
     parser.add_argument('--urls', nargs='*', 
                        help='Direkte URL-Eingabe für Demo')
+    parser.add_argument('--urls-file', type=Path,
+                       help='Datei mit URLs (eine pro Zeile)')
     
     args = parser.parse_args()
     
+    urls = list(args.urls or [])
+    if args.urls_file:
+        urls.extend(filter_urls(args.urls_file.read_text(encoding='utf-8').splitlines()))
+    
     # Demo-Instanz erstellen
     demo = VideoDownloaderDemo()
     
     try:
-        if args.urls:
-            # Direkte URLs verwenden
-            demo.console.print(f"[blue]🎯 Verwende {len(args.urls)} direkte URLs[/blue]")
+        # Eine HTTP-Session für alle Downloads der Demo
+        async with demo:
+            if urls:
+                # Direkte URLs verwenden
+                demo.console.print(f"[blue]🎯 Verwende {len(urls)} direkte URLs[/blue]")
             
-            # URL-Analyse
-            analyses, report = await demo.demo_url_analysis(args.urls)
+                # URL-Analyse
+                analyses, report = await demo.demo_url_analysis(urls)
             
-            # Performance-Monitoring
-            baseline = await demo.demo_performance_monitoring()
+                # Performance-Monitoring
+                baseline = await demo.demo_performance_monitoring()
             
-            # Downloads
-            results = await demo.demo_download_with_monitoring(args.urls, args.config)
+                # Downloads
+                results = await demo.demo_download_with_monitoring(urls, args.config)
             
-            # Statistiken
-            await demo.demo_statistics_and_history()
+                # Statistiken
+                await demo.demo_statistics_and_history()
             
-        else:
-            # Vollständige Demo
-            await demo.run_complete_demo(args.config, args.interactive)
+            else:
+                # Vollständige Demo
+                await demo.run_complete_demo(args.config, args.interactive)
             
     except KeyboardInterrupt:
         demo.console.print("\n[yellow]⏹️ Demo durch Benutzer abgebrochen[/yellow]")
@@ -331,6 +418,13 @@ if __name__ == "__main__":
     # Eventloop für Windows-Kompatibilität
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    else:
+        # uvloop (libuv) als schnellere Eventloop, falls installiert
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
@@ -7,16 +7,34 @@ Automatisiert Installation und Konfiguration
 import asyncio
 import os
 import platform
+import shlex
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Union
 
 import click
 
 
-def run_command(command: str, shell: bool = True) -> tuple[bool, str]:
-    """Führt Shell-Kommando aus und gibt Erfolg + Output zurück"""
+NORDVPN_INSTALL_URL = "https://downloads.nordcdn.com/apps/linux/install.sh"
+
+
+@lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Sucht ein Programm im PATH (gecacht)"""
+    return shutil.which(name)
+
+
+def _cmd(name: str, *args: str) -> List[str]:
+    """Baut eine argv-Liste mit aufgelöstem Programmpfad"""
+    return [_which(name) or name, *args]
+
+
+def run_command(command: Union[List[str], str], shell: bool = False) -> tuple[bool, str]:
+    """Führt Kommando (argv-Liste, Shell-String nur für Pipelines) aus und gibt Erfolg + Output zurück"""
     try:
         result = subprocess.run(
             command, 
@@ -32,6 +50,26 @@ def run_command(command: str, shell: bool = True) -> tuple[bool, str]:
         return False, str(e)
 
 
+def _probe_ffmpeg() -> bool:
+    """Prüft ob FFmpeg installiert ist"""
+    return run_command(_cmd("ffmpeg", "-version"))[0]
+
+
+def _probe_nordvpn() -> bool:
+    """Prüft ob NordVPN CLI installiert ist"""
+    return run_command(_cmd("nordvpn", "--version"))[0]
+
+
+def check_tools(probes: Dict[str, Callable[[], bool]]) -> Dict[str, bool]:
+    """Führt unabhängige Versions-Checks parallel aus"""
+    if not probes:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {name: executor.submit(probe) for name, probe in probes.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
 def check_python_version() -> bool:
     """Überprüft Python-Version (min. 3.9)"""
     version = sys.version_info
@@ -43,13 +81,14 @@ def check_python_version() -> bool:
         return False
 
 
-def install_nordvpn() -> bool:
+def install_nordvpn(installed: Optional[bool] = None) -> bool:
     """Installiert NordVPN CLI falls nicht vorhanden"""
     system = platform.system().lower()
     
     # Prüfe ob NordVPN bereits installiert ist
-    success, _ = run_command("nordvpn --version")
-    if success:
+    if installed is None:
+        installed = _probe_nordvpn()
+    if installed:
         click.echo("✅ NordVPN CLI bereits installiert")
         return True
     
@@ -57,13 +96,14 @@ def install_nordvpn() -> bool:
     
     if system == "linux":
         # Ubuntu/Debian Installation
+        # Einzige Pipeline mit Shell, die URL wird dafür gequotet
         commands = [
-            "curl -sSf https://downloads.nordcdn.com/apps/linux/install.sh | sh",
-            "sudo usermod -aG nordvpn $USER"
+            f"curl -sSf {shlex.quote(NORDVPN_INSTALL_URL)} | sh",
+            _cmd("sudo", "usermod", "-aG", "nordvpn", os.environ.get("USER", ""))
         ]
     elif system == "darwin":  # macOS
         commands = [
-            "brew install --cask nordvpn"
+            _cmd("brew", "install", "--cask", "nordvpn")
         ]
     else:
         click.echo("⚠️ Automatische NordVPN-Installation nur für Linux/macOS")
@@ -71,9 +111,9 @@ def install_nordvpn() -> bool:
         return False
     
     for cmd in commands:
-        success, output = run_command(cmd)
+        success, output = run_command(cmd, shell=isinstance(cmd, str))
         if not success:
-            click.echo(f"❌ Fehler bei: {cmd}")
+            click.echo(f"❌ Fehler bei: {cmd if isinstance(cmd, str) else shlex.join(cmd)}")
             click.echo(f"Output: {output}")
             return False
     
@@ -82,10 +122,11 @@ def install_nordvpn() -> bool:
     return True
 
 
-def install_ffmpeg() -> bool:
+def install_ffmpeg(installed: Optional[bool] = None) -> bool:
     """Installiert FFmpeg falls nicht vorhanden"""
-    success, _ = run_command("ffmpeg -version")
-    if success:
+    if installed is None:
+        installed = _probe_ffmpeg()
+    if installed:
         click.echo("✅ FFmpeg bereits installiert")
         return True
     
@@ -93,9 +134,11 @@ def install_ffmpeg() -> bool:
     system = platform.system().lower()
     
     if system == "linux":
-        success, output = run_command("sudo apt update && sudo apt install -y ffmpeg")
+        success, output = run_command(_cmd("sudo", "apt", "update"))
+        if success:
+            success, output = run_command(_cmd("sudo", "apt", "install", "-y", "ffmpeg"))
     elif system == "darwin":
-        success, output = run_command("brew install ffmpeg")
+        success, output = run_command(_cmd("brew", "install", "ffmpeg"))
     elif system == "windows":
         click.echo("⚠️ Bitte installieren Sie FFmpeg manuell für Windows")
         click.echo("Download: https://ffmpeg.org/download.html")
@@ -119,7 +162,7 @@ def install_python_dependencies() -> bool:
     venv_path = Path("venv")
     if not venv_path.exists():
         click.echo("🔧 Erstelle Virtual Environment...")
-        success, output = run_command(f"{sys.executable} -m venv venv")
+        success, output = run_command([sys.executable, "-m", "venv", "venv"])
         if not success:
             click.echo(f"❌ Virtual Environment fehlgeschlagen: {output}")
             return False
@@ -130,13 +173,13 @@ def install_python_dependencies() -> bool:
     else:
         pip_cmd = "venv/bin/pip"
     
-    success, output = run_command(f"{pip_cmd} install --upgrade pip")
+    success, output = run_command([pip_cmd, "install", "--upgrade", "pip"])
     if not success:
         click.echo(f"❌ Pip upgrade fehlgeschlagen: {output}")
         return False
     
     # Requirements installieren
-    success, output = run_command(f"{pip_cmd} install -r requirements.txt")
+    success, output = run_command([pip_cmd, "install", "-r", "requirements.txt"])
     if not success:
         click.echo(f"❌ Requirements-Installation fehlgeschlagen: {output}")
         return False
@@ -147,7 +190,7 @@ def install_python_dependencies() -> bool:
     else:
         playwright_cmd = "venv/bin/playwright"
     
-    success, output = run_command(f"{playwright_cmd} install chromium")
+    success, output = run_command([playwright_cmd, "install", "chromium"])
     if not success:
         click.echo(f"❌ Playwright Browser-Installation fehlgeschlagen: {output}")
         return False
@@ -176,9 +219,11 @@ def create_config_files():
             "log_level": "INFO"
         }
         
-        import json
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, indent=2, ensure_ascii=False)
+        # Erst nach der Dependency-Installation importierbar
+        import orjson
+        from video_downloader import _atomic_write_bytes
+        
+        _atomic_write_bytes(config_path, orjson.dumps(default_config, option=orjson.OPT_INDENT_2))
         
         click.echo("✅ config.json erstellt")
     
@@ -232,7 +277,7 @@ if __name__ == "__main__":
 """
         
         # Test-Script ausführen
-        success, output = run_command(f'{python_cmd} -c "{test_script}"')
+        success, output = run_command([python_cmd, "-c", test_script])
         if success:
             click.echo("✅ Alle Tests bestanden")
             return True
@@ -291,13 +336,20 @@ def main(skip_vpn: bool, skip_ffmpeg: bool, skip_tests: bool):
     if not check_python_version():
         sys.exit(1)
     
-    # Schritt 2: System-Dependencies
+    # Schritt 2: System-Dependencies (Versions-Checks parallel)
+    probes = {}
+    if not skip_ffmpeg:
+        probes['ffmpeg'] = _probe_ffmpeg
+    if not skip_vpn:
+        probes['nordvpn'] = _probe_nordvpn
+    installed = check_tools(probes)
+    
     if not skip_ffmpeg:
-        if not install_ffmpeg():
+        if not install_ffmpeg(installed['ffmpeg']):
             click.echo("⚠️ FFmpeg-Installation fehlgeschlagen, aber weiter...")
     
     if not skip_vpn:
-        if not install_nordvpn():
+        if not install_nordvpn(installed['nordvpn']):
             click.echo("⚠️ NordVPN-Installation fehlgeschlagen, aber weiter...")
     
     # Schritt 3: Python-Dependencies
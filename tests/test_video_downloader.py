@@ -5,19 +5,25 @@ Tests für alle Module mit pytest, asyncio und Mock-Integration
 """
 
 import asyncio
-import json
+import os
+import shutil
 import tempfile
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import List
 
+import orjson
 import pytest
 from pydantic import ValidationError
 
 # Import der zu testenden Module
 from video_downloader import (
     WebVideoDownloader, VPNManager, VideoExtractor, HumanBehaviorSimulator,
-    SiteConfig, GlobalConfig, VideoInfo, DownloadResult
+    SiteConfig, GlobalConfig, VideoInfo, DownloadResult,
+    load_config, load_global_config
 )
 from utilities import (
     VideoAnalyzer, PerformanceMonitor, DownloadHistory,
@@ -29,9 +35,9 @@ from utilities import (
 # FIXTURES
 # ================================================================
 
-@pytest.fixture
-def temp_config_file():
-    """Erstellt temporäre Konfigurationsdatei für Tests"""
+@pytest.fixture(scope="session")
+def temp_config_file(tmp_path_factory):
+    """Erstellt temporäre Konfigurationsdatei für Tests (einmal pro Session)"""
     config_data = {
         "sites": {
             "test-site.com": {
@@ -50,12 +56,17 @@ def temp_config_file():
         "log_level": "DEBUG"
     }
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-        json.dump(config_data, f)
-        yield f.name
-    
-    # Cleanup
-    Path(f.name).unlink(missing_ok=True)
+    config_file = tmp_path_factory.mktemp("cfg") / "config.json"
+    config_file.write_bytes(orjson.dumps(config_data))
+    return str(config_file)
+
+
+@pytest.fixture
+def mutable_config_file(temp_config_file, tmp_path):
+    """Kopie der Session-Konfiguration für Tests, die die Datei verändern"""
+    config_file = tmp_path / "config.json"
+    shutil.copy(temp_config_file, config_file)
+    return str(config_file)
 
 
 @pytest.fixture
@@ -65,6 +76,18 @@ def temp_download_dir():
         yield Path(temp_dir)
 
 
+@pytest.fixture(scope="module")
+def analyzer():
+    """Geteilter VideoAnalyzer (zustandslos) für alle Analyse-Tests"""
+    return VideoAnalyzer()
+
+
+@pytest.fixture(scope="module")
+def recovery():
+    """Geteilte ErrorRecovery-Instanz (zustandslos)"""
+    return ErrorRecovery()
+
+
 @pytest.fixture
 def sample_video_info():
     """Sample VideoInfo für Tests"""
@@ -128,6 +151,26 @@ class TestConfiguration:
         """Test: Validierung der globalen Konfiguration"""
         with pytest.raises(ValidationError):
             GlobalConfig(concurrent_downloads=-1)  # Negative Werte nicht erlaubt
+    
+    def test_load_config_cached(self, mutable_config_file):
+        """Test: Konfiguration wird gecacht und bei Änderung neu geladen"""
+        config = load_config(mutable_config_file)
+        config['sites'].clear()
+        
+        # Gecachter Eintrag bleibt von Änderungen der Kopie unberührt
+        assert "test-site.com" in load_config(mutable_config_file)['sites']
+        
+        Path(mutable_config_file).write_bytes(orjson.dumps({"sites": {}}))
+        assert load_config(mutable_config_file)['sites'] == {}
+    
+    def test_load_global_config_cached(self, mutable_config_file):
+        """Test: Validierte Konfiguration wird gecacht, Aufrufer erhalten eigene Kopien"""
+        first = load_global_config(mutable_config_file)
+        first.sites.clear()
+        
+        second = load_global_config(mutable_config_file)
+        assert second is not first
+        assert "test-site.com" in second.sites
 
 
 # ================================================================
@@ -151,25 +194,26 @@ class TestVPNManager:
         assert result == True  # Sollte True zurückgeben auch wenn deaktiviert
     
     @pytest.mark.asyncio
-    @patch('subprocess.run')
-    async def test_vpn_connect_success(self, mock_subprocess):
+    @patch('asyncio.create_subprocess_exec')
+    async def test_vpn_connect_success(self, mock_exec):
         """Test: Erfolgreiche VPN-Verbindung"""
-        mock_subprocess.return_value.returncode = 0
-        mock_subprocess.return_value.stderr = ""
+        mock_exec.return_value.returncode = 0
+        mock_exec.return_value.communicate = AsyncMock(return_value=(b"", b""))
         
         vpn = VPNManager(enabled=True)
         result = await vpn.connect_to_random_server()
         
         assert result == True
         assert vpn.current_server is not None
-        mock_subprocess.assert_called_once()
+        mock_exec.assert_called_once()
+        assert mock_exec.call_args.args == ("nordvpn", "connect", vpn.current_server)
     
     @pytest.mark.asyncio
-    @patch('subprocess.run')
-    async def test_vpn_connect_failure(self, mock_subprocess):
+    @patch('asyncio.create_subprocess_exec')
+    async def test_vpn_connect_failure(self, mock_exec):
         """Test: Fehlgeschlagene VPN-Verbindung"""
-        mock_subprocess.return_value.returncode = 1
-        mock_subprocess.return_value.stderr = "Connection failed"
+        mock_exec.return_value.returncode = 1
+        mock_exec.return_value.communicate = AsyncMock(return_value=(b"", b"Connection failed"))
         
         vpn = VPNManager(enabled=True)
         result = await vpn.connect_to_random_server()
@@ -191,6 +235,31 @@ class TestVPNManager:
         
         assert ip == "192.168.1.1"
 
+    @pytest.mark.asyncio
+    @patch('aiohttp.ClientSession.get')
+    async def test_get_current_ip_cached(self, mock_get):
+        """Test: IP-Adresse wird bis zur nächsten Rotation gecacht"""
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.json.return_value = {"origin": "192.168.1.1"}
+        mock_get.return_value.__aenter__.return_value = mock_response
+
+        vpn = VPNManager(enabled=False)
+        assert await vpn.get_current_ip() == "192.168.1.1"
+        assert await vpn.get_current_ip() == "192.168.1.1"
+        assert mock_get.call_count == 1
+
+        # Nach Invalidierung (z.B. durch Rotation) wird neu abgefragt
+        vpn._ip_cache = None
+        await vpn.get_current_ip()
+        assert mock_get.call_count == 2
+        
+        # Beide Abfragen nutzen dieselbe eigene Session
+        own_session = vpn._own_session
+        assert own_session is not None
+        await vpn.aclose()
+        assert own_session.closed
+
 
 # ================================================================
 # HUMAN BEHAVIOR SIMULATOR TESTS
@@ -199,22 +268,34 @@ class TestVPNManager:
 class TestHumanBehaviorSimulator:
     """Tests für Human-Behavior-Simulator"""
     
+    @pytest.fixture(autouse=True)
+    def sleeps(self, monkeypatch):
+        """Ersetzt asyncio.sleep durch einen Stub, der die angeforderten Sekunden aufzeichnet"""
+        requested = []
+        real_sleep = asyncio.sleep
+        
+        async def fake_sleep(delay, *args, **kwargs):
+            requested.append(delay)
+            await real_sleep(0)
+        
+        monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+        return requested
+    
     def test_human_behavior_init(self):
         """Test: Initialisierung des Simulators"""
         simulator = HumanBehaviorSimulator()
         assert simulator.logger is not None
     
     @pytest.mark.asyncio
-    async def test_random_delay(self):
+    async def test_random_delay(self, sleeps):
         """Test: Zufällige Verzögerung"""
         simulator = HumanBehaviorSimulator()
         
-        import time
-        start_time = time.time()
         await simulator.random_delay(0.1, 0.2)
-        elapsed = time.time() - start_time
         
-        assert 0.1 <= elapsed <= 0.3  # Etwas Toleranz für Timing
+        # Virtuelle Zeit statt Wanduhr, kein echtes Warten
+        assert len(sleeps) == 1
+        assert 0.1 <= sleeps[0] <= 0.2
     
     @pytest.mark.asyncio
     async def test_human_click_element_not_found(self):
@@ -258,12 +339,21 @@ class TestVideoExtractor:
         filename_no_title = extractor._get_safe_filename("https://example.com/page")
         assert "example.com" in filename_no_title
     
+    def test_find_video_file(self, temp_download_dir):
+        """Test: Heruntergeladene Videodatei finden"""
+        extractor = VideoExtractor(str(temp_download_dir))
+        (temp_download_dir / "clip[1].info.json").write_text("{}")
+        (temp_download_dir / "clip[1].mp4").write_bytes(b"")
+        
+        assert extractor._find_video_file("clip[1]") == temp_download_dir / "clip[1].mp4"
+        assert extractor._find_video_file("other") is None
+    
     @pytest.mark.asyncio
     @patch('yt_dlp.YoutubeDL')
     async def test_extract_video_info_success(self, mock_ytdl, temp_download_dir):
         """Test: Erfolgreiche Video-Info-Extraktion"""
         # Mock yt-dlp Response
-        mock_instance = mock_ytdl.return_value.__enter__.return_value
+        mock_instance = mock_ytdl.return_value
         mock_instance.extract_info.return_value = {
             'title': 'Test Video',
             'duration': 120,
@@ -284,13 +374,24 @@ class TestVideoExtractor:
     @patch('yt_dlp.YoutubeDL')
     async def test_extract_video_info_failure(self, mock_ytdl, temp_download_dir):
         """Test: Fehlgeschlagene Video-Info-Extraktion"""
-        mock_instance = mock_ytdl.return_value.__enter__.return_value
+        mock_instance = mock_ytdl.return_value
         mock_instance.extract_info.side_effect = Exception("Extraction failed")
         
         extractor = VideoExtractor(str(temp_download_dir))
         video_info = await extractor.extract_video_info("https://invalid.com/video")
         
         assert video_info is None
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_info_ydl_reused(self, mock_ytdl, temp_download_dir):
+        """Test: YoutubeDL-Instanz wird pro Thread wiederverwendet und beim Schließen freigegeben"""
+        extractor = VideoExtractor(str(temp_download_dir))
+        
+        assert extractor._get_info_ydl() is extractor._get_info_ydl()
+        assert mock_ytdl.call_count == 1
+        
+        extractor.close()
+        mock_ytdl.return_value.close.assert_called_once()
 
 
 # ================================================================
@@ -300,33 +401,35 @@ class TestVideoExtractor:
 class TestVideoAnalyzer:
     """Tests für Video-Analyzer"""
     
-    def test_video_analyzer_init(self):
+    def test_video_analyzer_init(self, analyzer):
         """Test: Initialisierung des Analyzers"""
-        analyzer = VideoAnalyzer()
         assert len(analyzer.video_extensions) > 0
         assert len(analyzer.streaming_domains) > 0
     
-    def test_analyze_direct_video_url(self):
+    def test_analyze_direct_video_url(self, analyzer):
         """Test: Analyse einer direkten Video-URL"""
-        analyzer = VideoAnalyzer()
         analysis = analyzer.analyze_url("https://example.com/video.mp4")
         
         assert analysis['is_direct_video'] == True
         assert analysis['estimated_complexity'] == 'low'
         assert analysis['suggested_method'] == 'direct_download'
     
-    def test_analyze_streaming_platform(self):
+    def test_analyze_streaming_platform(self, analyzer):
         """Test: Analyse einer Streaming-Plattform"""
-        analyzer = VideoAnalyzer()
         analysis = analyzer.analyze_url("https://youtube.com/watch?v=abc123")
         
         assert analysis['is_streaming_platform'] == True
         assert analysis['estimated_complexity'] == 'medium'
         assert analysis['suggested_method'] == 'yt_dlp'
     
-    def test_analyze_unknown_site(self):
+    def test_analyze_streaming_subdomain(self, analyzer):
+        """Test: Subdomains von Streaming-Plattformen werden erkannt"""
+        assert analyzer.analyze_url("https://m.youtube.com/watch?v=abc123")['suggested_method'] == 'yt_dlp'
+        assert analyzer.analyze_url("https://music.youtube.com/watch?v=abc")['is_streaming_platform'] == True
+        assert analyzer.analyze_url("https://notyoutube.com/watch")['is_streaming_platform'] == False
+    
+    def test_analyze_unknown_site(self, analyzer):
         """Test: Analyse einer unbekannten Site"""
-        analyzer = VideoAnalyzer()
         analysis = analyzer.analyze_url("https://unknown-site.com/player/video")
         
         assert analysis['is_direct_video'] == False
@@ -334,17 +437,15 @@ class TestVideoAnalyzer:
         assert analysis['estimated_complexity'] == 'high'
         assert analysis['suggested_method'] == 'browser_automation'
     
-    def test_batch_analyze(self, sample_urls):
+    def test_batch_analyze(self, analyzer, sample_urls):
         """Test: Batch-Analyse mehrerer URLs"""
-        analyzer = VideoAnalyzer()
         analyses = analyzer.batch_analyze(sample_urls)
         
         assert len(analyses) == len(sample_urls)
         assert all('url' in analysis for analysis in analyses)
     
-    def test_generate_analysis_report(self, sample_urls):
+    def test_generate_analysis_report(self, analyzer, sample_urls):
         """Test: Generierung des Analyse-Berichts"""
-        analyzer = VideoAnalyzer()
         analyses = analyzer.batch_analyze(sample_urls)
         report = analyzer.generate_analysis_report(analyses)
         
@@ -362,6 +463,16 @@ class TestVideoAnalyzer:
 class TestPerformanceMonitor:
     """Tests für Performance-Monitor"""
     
+    @pytest.fixture(autouse=True)
+    def _mock_psutil(self, monkeypatch):
+        """Ersetzt psutil-Systemabfragen durch feste Werte"""
+        import psutil
+        
+        monkeypatch.setattr(psutil, 'cpu_percent', lambda interval=None: 10.0)
+        monkeypatch.setattr(psutil, 'virtual_memory', lambda: SimpleNamespace(used=1 << 30))
+        monkeypatch.setattr(psutil, 'net_io_counters', lambda: SimpleNamespace(bytes_sent=100, bytes_recv=200))
+        monkeypatch.setattr(psutil, 'disk_io_counters', lambda: SimpleNamespace(read_bytes=300, write_bytes=400))
+    
     def test_performance_monitor_init(self):
         """Test: Initialisierung des Performance-Monitors"""
         monitor = PerformanceMonitor()
@@ -388,6 +499,36 @@ class TestPerformanceMonitor:
         
         assert len(monitor.metrics_history) == 1000  # Sollte auf 1000 begrenzt sein
     
+    def test_window_metrics(self):
+        """Test: Durchschnitts-Metriken für ein Zeitfenster"""
+        from datetime import datetime
+        
+        monitor = PerformanceMonitor()
+        start = datetime.now()
+        monitor.capture_metrics(active_downloads=1)
+        monitor.capture_metrics(active_downloads=3)
+        window = monitor.get_window_metrics(start, datetime.now())
+        
+        assert window['total_metrics_count'] == 2
+        assert window['max_active_downloads'] == 3
+        assert monitor.get_window_metrics(datetime.now(), datetime.now()) == {}
+    
+    @pytest.mark.asyncio
+    async def test_background_sampling(self):
+        """Test: Periodische Metriken-Erfassung im Hintergrund"""
+        monitor = PerformanceMonitor()
+        monitor.start_background(interval=0.01, active_downloads=lambda: 2)
+        await asyncio.sleep(0.3)
+        await monitor.stop_background()
+        
+        count = len(monitor.metrics_history)
+        assert count >= 1
+        assert all(m.active_downloads == 2 for m in monitor.metrics_history)
+        
+        # Nach dem Stoppen kommen keine weiteren Metriken hinzu
+        await asyncio.sleep(0.05)
+        assert len(monitor.metrics_history) == count
+    
     def test_export_metrics(self, temp_download_dir):
         """Test: Metriken-Export"""
         monitor = PerformanceMonitor()
@@ -399,8 +540,7 @@ class TestPerformanceMonitor:
         assert export_file.exists()
         
         # Validiere JSON-Struktur
-        with open(export_file) as f:
-            data = json.load(f)
+        data = orjson.loads(export_file.read_bytes())
         
         assert len(data) == 1
         assert 'timestamp' in data[0]
@@ -420,10 +560,8 @@ class TestErrorRecovery:
         assert recovery.max_retries == 5
         assert len(recovery.error_patterns) > 0
     
-    def test_categorize_network_error(self):
+    def test_categorize_network_error(self, recovery):
         """Test: Kategorisierung von Netzwerk-Fehlern"""
-        recovery = ErrorRecovery()
-        
         category = recovery.categorize_error("Connection timeout after 30 seconds")
         assert category == 'network_timeout'
         
@@ -433,10 +571,13 @@ class TestErrorRecovery:
         category = recovery.categorize_error("Access forbidden")
         assert category == 'access_denied'
     
-    def test_suggest_recovery_action(self):
+    def test_categorize_error_priority(self, recovery):
+        """Test: Bei mehreren Treffern gewinnt die zuerst definierte Kategorie"""
+        assert recovery.categorize_error("HTTP 403, then TIMEOUT") == 'network_timeout'
+        assert recovery.categorize_error("Something else went wrong") == 'unknown'
+    
+    def test_suggest_recovery_action(self, recovery):
         """Test: Recovery-Aktions-Vorschläge"""
-        recovery = ErrorRecovery()
-        
         # Netzwerk-Timeout
         action = recovery.suggest_recovery_action('network_timeout', attempt=1)
         assert action['action'] == 'retry_with_delay'
@@ -469,10 +610,20 @@ class TestDownloadHistory:
         assert history.db_path == db_path
         assert db_path.exists()
     
-    def test_add_download_success(self, temp_download_dir):
-        """Test: Erfolgreichen Download zur Historie hinzufügen"""
+    def test_download_history_wal_mode(self, temp_download_dir):
+        """Test: Datenbank läuft im WAL-Modus"""
+        import sqlite3
+        
         db_path = temp_download_dir / "test_history.db"
-        history = DownloadHistory(str(db_path))
+        DownloadHistory(str(db_path))
+        
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    def test_add_download_success(self):
+        """Test: Erfolgreichen Download zur Historie hinzufügen"""
+        # In-Memory-Datenbank, Datei-Zugriff prüfen die Tests oben
+        history = DownloadHistory(":memory:")
         
         history.add_download(
             url="https://test.com/video.mp4",
@@ -488,10 +639,9 @@ class TestDownloadHistory:
         assert stats['successful'] == 1
         assert stats['failed'] == 0
     
-    def test_add_download_failure(self, temp_download_dir):
+    def test_add_download_failure(self):
         """Test: Fehlgeschlagenen Download zur Historie hinzufügen"""
-        db_path = temp_download_dir / "test_history.db"
-        history = DownloadHistory(str(db_path))
+        history = DownloadHistory(":memory:")
         
         history.add_download(
             url="https://test.com/invalid.mp4",
@@ -503,6 +653,56 @@ class TestDownloadHistory:
         assert stats['total_downloads'] == 1
         assert stats['successful'] == 0
         assert stats['failed'] == 1
+    
+    def test_add_many(self):
+        """Test: Mehrere Downloads in einer Transaktion hinzufügen"""
+        history = DownloadHistory(":memory:")
+        
+        history.add_many([
+            {'url': "https://www.test.com/a.mp4", 'success': True, 'download_time': 1.0},
+            {'url': "https://test.com/b.mp4", 'success': False, 'error_message': "Video not found"},
+            {'url': "https://other.com/c.mp4", 'success': True}
+        ])
+        
+        stats = history.get_download_stats(days=1)
+        assert stats['total_downloads'] == 3
+        assert stats['successful'] == 2
+        assert stats['top_domains'][0] == {'domain': 'test.com', 'count': 2}
+    
+    def test_daily_stats_rollup(self):
+        """Test: Tages-Aggregate folgen Einfügen und Löschen"""
+        history = DownloadHistory(":memory:")
+        
+        history.add_many([
+            {'url': "https://test.com/a.mp4", 'success': True, 'filesize': 100, 'download_time': 2.0},
+            {'url': "https://test.com/b.mp4", 'success': True, 'filesize': 50}
+        ])
+        
+        stats = history.get_download_stats(days=1)
+        assert stats['total_downloads'] == 2
+        assert stats['avg_download_time'] == 2.0
+        
+        history.cleanup_old_entries(days=-1)
+        
+        with history._connect() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM downloads_daily_stats").fetchone()[0] == 0
+        assert history.get_download_stats(days=1)['total_downloads'] == 0
+    
+    def test_stats_share_day_window(self):
+        """Test: Summen und Fehleranalyse nutzen dieselbe Tagesgrenze"""
+        history = DownloadHistory(":memory:")
+        cutoff_day = (datetime.now(timezone.utc) - timedelta(days=1)).date().isoformat()
+        
+        # Früh am Stichtag, also vor dem exakten Zeitpunkt "jetzt minus 1 Tag"
+        with history._connect() as conn:
+            conn.execute("""
+                INSERT INTO downloads (url, domain, success, error_message, timestamp)
+                VALUES ('https://test.com/a.mp4', 'test.com', 0, 'Video not found', ?)
+            """, (f"{cutoff_day} 00:00:00",))
+        
+        stats = history.get_download_stats(days=1)
+        assert stats['failed'] == 1
+        assert stats['common_errors'] == [{'error_message': 'Video not found', 'count': 1}]
 
 
 # ================================================================
@@ -519,7 +719,33 @@ class TestWebVideoDownloaderIntegration:
         assert downloader.config is not None
         assert downloader.vpn_manager is not None
         assert downloader.video_extractor is not None
-    
+
+    def test_downloader_initialization_from_dict(self, temp_download_dir):
+        """Test: Initialisierung mit Config-Dict ohne Konfigurationsdatei"""
+        downloader = WebVideoDownloader({
+            "output_directory": str(temp_download_dir),
+            "nordvpn_enabled": False,
+            "concurrent_downloads": 2
+        })
+
+        assert downloader.config_path is None
+        assert downloader.config.concurrent_downloads == 2
+        assert downloader.vpn_manager.enabled == False
+
+    def test_site_config_lookup_strips_leading_www(self, temp_download_dir):
+        """Test: Nur ein führendes 'www.' wird beim Domain-Abgleich entfernt"""
+        downloader = WebVideoDownloader({
+            "output_directory": str(temp_download_dir),
+            "nordvpn_enabled": False,
+            "sites": {
+                "example.com": {"video_button": [".play"]},
+                "mywww.example.com": {"video_button": [".mine"]}
+            }
+        })
+
+        assert downloader._get_site_config("https://www.example.com/x").video_button == [".play"]
+        assert downloader._get_site_config("https://mywww.example.com/x").video_button == [".mine"]
+
     @pytest.mark.asyncio
     async def test_downloader_context_manager(self, temp_config_file):
         """Test: Context Manager des Downloaders"""
@@ -548,6 +774,139 @@ class TestWebVideoDownloaderIntegration:
         assert len(results) == 2
         assert all(result.success for result in results)
         assert mock_process.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_browser_context_reused(self, temp_config_file):
+        """Test: Browser-Kontext wird pro User-Agent wiederverwendet und nach Limit erneuert"""
+        downloader = WebVideoDownloader(temp_config_file)
+        downloader.config.user_agents = ["Test-UA"]
+        downloader.browser = MagicMock()
+        downloader.browser.new_context = AsyncMock(side_effect=lambda **kwargs: MagicMock(
+            pages=[], new_page=AsyncMock(), add_init_script=AsyncMock(),
+            route=AsyncMock(), close=AsyncMock()
+        ))
+        downloader._context_lock = asyncio.Lock()
+        
+        await downloader._create_page()
+        await downloader._create_page()
+        assert downloader.browser.new_context.call_count == 1
+        
+        downloader._context_pages["Test-UA"] = downloader.CONTEXT_RECYCLE_PAGES
+        await downloader._create_page()
+        assert downloader.browser.new_context.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_browser_context_recycle_concurrent(self, temp_config_file):
+        """Test: Paralleles Öffnen am Recycle-Limit schließt keinen Kontext mit offener Seite"""
+        downloader = WebVideoDownloader(temp_config_file)
+        downloader.config.user_agents = ["Test-UA"]
+        
+        def make_context(**kwargs):
+            context = MagicMock(pages=[], closed=False,
+                                add_init_script=AsyncMock(), route=AsyncMock())
+            
+            async def new_page():
+                await asyncio.sleep(0)  # Round-Trip zum Browser simulieren
+                if context.closed:
+                    raise RuntimeError("Target page, context or browser has been closed")
+                page = MagicMock()
+                context.pages.append(page)
+                return page
+            
+            async def close():
+                context.closed = True
+            
+            context.new_page = new_page
+            context.close = close
+            return context
+        
+        downloader.browser = MagicMock()
+        downloader.browser.new_context = AsyncMock(side_effect=make_context)
+        downloader._context_lock = asyncio.Lock()
+        
+        await downloader._create_page()
+        context = downloader._contexts["Test-UA"]
+        context.pages.clear()  # erste Seite wieder geschlossen
+        
+        # Der erste Aufruf erreicht das Limit, der zweite darf den Kontext nicht schließen,
+        # solange die Seite des ersten noch geöffnet wird
+        downloader._context_pages["Test-UA"] = downloader.CONTEXT_RECYCLE_PAGES - 1
+        pages = await asyncio.gather(downloader._create_page(), downloader._create_page())
+        
+        assert len(pages) == 2
+        assert not context.closed
+        assert downloader.browser.new_context.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_login_session_restored(self, temp_download_dir):
+        """Test: Gespeicherte Login-Cookies ersetzen das Formular-Login"""
+        downloader = WebVideoDownloader({
+            "output_directory": str(temp_download_dir),
+            "session_state_dir": str(temp_download_dir / "state"),
+            "nordvpn_enabled": False
+        })
+        site_config = SiteConfig(login_username="user", login_password="pass",
+                                 login_url="https://test-site.com/login")
+        cookies = [{"name": "sid", "value": "1", "domain": "test-site.com", "path": "/"}]
+        
+        page = MagicMock(url="https://test-site.com/login")
+        page.context.cookies = AsyncMock(return_value=cookies)
+        await downloader._save_session(page, "test-site.com", [page.url])
+        
+        state_path = downloader._session_state_path("test-site.com")
+        if os.name == "posix":
+            assert state_path.stat().st_mode & 0o777 == 0o600
+        
+        # Neuer Lauf: Cookies kommen aus der Datei, kein Formular-Login
+        downloader.session_cookies.clear()
+        page = MagicMock(url="about:blank")
+        page.context.add_cookies = AsyncMock()
+        page.goto = AsyncMock()
+        page.locator.return_value.first.is_visible = AsyncMock(return_value=False)
+        page.fill = AsyncMock()
+        
+        assert await downloader._handle_login(page, site_config) == True
+        page.context.add_cookies.assert_awaited_once_with(cookies)
+        page.fill.assert_not_called()
+        
+        # Abgelaufene Sitzung wird ignoriert, im Speicher wie in der Datei
+        site_config.session_ttl = -1
+        assert await downloader._restore_session(page, "test-site.com", site_config) == False
+        downloader.session_cookies.clear()
+        assert await downloader._restore_session(page, "test-site.com", site_config) == False
+    
+    @pytest.mark.asyncio
+    async def test_login_session_expired_on_server(self, temp_download_dir):
+        """Test: Vom Server verworfene Sitzung fällt auf das Formular-Login zurück"""
+        downloader = WebVideoDownloader({
+            "output_directory": str(temp_download_dir),
+            "session_state_dir": str(temp_download_dir / "state"),
+            "nordvpn_enabled": False
+        })
+        downloader.human_behavior = MagicMock(random_delay=AsyncMock(), human_click=AsyncMock())
+        site_config = SiteConfig(login_username="user", login_password="pass",
+                                 login_url="https://test-site.com/login", wait_after_login=0)
+        cookies = [{"name": "sid", "value": "1", "domain": "test-site.com", "path": "/"}]
+        downloader.session_cookies["test-site.com"] = (cookies, time.time())
+        
+        # Neuladen leitet auf die Login-Seite um
+        page = MagicMock(url="https://test-site.com/videos")
+        async def redirect_to_login():
+            page.url = "https://test-site.com/login?next=/videos"
+        page.reload = AsyncMock(side_effect=redirect_to_login)
+        page.goto = AsyncMock()
+        page.locator.return_value.first.is_visible = AsyncMock(return_value=False)
+        page.context.add_cookies = AsyncMock()
+        page.context.cookies = AsyncMock(return_value=cookies)
+        page.fill = AsyncMock()
+        
+        with patch.object(downloader, "_drop_session", wraps=downloader._drop_session) as drop:
+            assert await downloader._handle_login(page, site_config) == True
+        
+        drop.assert_called_once_with("test-site.com")
+        assert page.fill.await_count == 2
+        # Nach dem Formular-Login liegt wieder eine frische Sitzung vor
+        assert downloader._session_state_path("test-site.com").exists()
 
 
 # ================================================================
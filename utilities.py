@@ -4,28 +4,39 @@ Erweiterte Utilities für Web Video Downloader
 Umfasst Monitoring, Analyse, Performance-Tracking und Debug-Tools
 """
 
-import json
+import asyncio
+import re
 import sqlite3
+import sys
+import threading
 import time
-from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import takewhile
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-import psutil
+import orjson
 import structlog
-from pydantic import BaseModel
-from rich.console import Console
-from rich.progress import Progress, TaskID
-from rich.table import Table
+
+# psutil und rich werden erst bei Bedarf importiert (Startzeit)
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 # ============================
 # PERFORMANCE MONITORING
 # ============================
 
-@dataclass
+# __slots__ für Dataclasses erst ab Python 3.10 verfügbar
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class PerformanceMetrics:
     """Performance-Metriken für Download-Vorgänge"""
     
@@ -45,18 +56,28 @@ class PerformanceMonitor:
     
     def __init__(self):
         self.logger = structlog.get_logger(__name__ + ".PerformanceMonitor")
-        self.metrics_history: List[PerformanceMetrics] = []
+        # Nur letzte 1000 Metriken behalten, ältere fallen automatisch heraus
+        self.metrics_history: Deque[PerformanceMetrics] = deque(maxlen=1000)
+        self._history_lock = threading.Lock()  # schützt Anhängen und Rückwärts-Iteration
         self.start_time = time.time()
+        import psutil
+        
+        self._psutil = psutil
         self.process = psutil.Process()
+        self._sampler_task: Optional[asyncio.Task] = None
+        
+        # Basiswert für nicht-blockierende CPU-Messung setzen
+        self._psutil.cpu_percent(interval=None)
     
     def capture_metrics(self, active_downloads: int = 0) -> PerformanceMetrics:
         """Erfasst aktuelle System-Metriken"""
         try:
-            # System-Metriken
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            network = psutil.net_io_counters()
-            disk_io = psutil.disk_io_counters()
+            # System-Metriken (CPU seit letztem Aufruf, ohne zu blockieren;
+            # Abstände unter ~0.1s können 0.0 liefern)
+            cpu_percent = self._psutil.cpu_percent(interval=None)
+            memory = self._psutil.virtual_memory()
+            network = self._psutil.net_io_counters()
+            disk_io = self._psutil.disk_io_counters()
             
             metrics = PerformanceMetrics(
                 timestamp=datetime.now(),
@@ -69,11 +90,8 @@ class PerformanceMonitor:
                 active_downloads=active_downloads
             )
             
-            self.metrics_history.append(metrics)
-            
-            # Nur letzte 1000 Metriken behalten
-            if len(self.metrics_history) > 1000:
-                self.metrics_history = self.metrics_history[-1000:]
+            with self._history_lock:
+                self.metrics_history.append(metrics)
             
             return metrics
             
@@ -90,32 +108,70 @@ class PerformanceMonitor:
                 active_downloads=active_downloads
             )
     
+    def start_background(self, interval: float = 0.5,
+                         active_downloads: Callable[[], int] = lambda: 0):
+        """Startet periodische Metriken-Erfassung im laufenden Event-Loop"""
+        if self._sampler_task and not self._sampler_task.done():
+            return
+        
+        async def _sample_loop():
+            while True:
+                # psutil-Abfragen sind Systemaufrufe, daher im Thread
+                await asyncio.to_thread(self.capture_metrics, active_downloads())
+                await asyncio.sleep(interval)
+        
+        self._sampler_task = asyncio.create_task(_sample_loop())
+    
+    async def stop_background(self):
+        """Beendet die periodische Metriken-Erfassung"""
+        if not self._sampler_task:
+            return
+        
+        self._sampler_task.cancel()
+        try:
+            await self._sampler_task
+        except asyncio.CancelledError:
+            pass
+        self._sampler_task = None
+    
     def get_average_metrics(self, minutes: int = 5) -> Dict[str, float]:
         """Berechnet Durchschnitts-Metriken der letzten N Minuten"""
         cutoff_time = datetime.now() - timedelta(minutes=minutes)
-        recent_metrics = [m for m in self.metrics_history if m.timestamp >= cutoff_time]
-        
-        if not recent_metrics:
+        return self._summarize(self._metrics_since(cutoff_time))
+    
+    def get_window_metrics(self, start: datetime, end: datetime) -> Dict[str, float]:
+        """Berechnet Durchschnitts-Metriken für ein Zeitfenster"""
+        return self._summarize([m for m in self._metrics_since(start) if m.timestamp <= end])
+    
+    def _metrics_since(self, start: datetime) -> List[PerformanceMetrics]:
+        """Liefert Metriken ab einem Zeitpunkt in zeitlicher Reihenfolge"""
+        # Die Historie ist zeitlich sortiert, daher nur vom Ende bis zur Grenze laufen;
+        # der Lock verhindert, dass der Sampler die Deque während der Iteration verändert
+        with self._history_lock:
+            recent = list(takewhile(lambda m: m.timestamp >= start, reversed(self.metrics_history)))
+        recent.reverse()
+        return recent
+    
+    def _summarize(self, metrics: List[PerformanceMetrics]) -> Dict[str, float]:
+        """Fasst Metriken zu Durchschnittswerten zusammen"""
+        if not metrics:
             return {}
         
         return {
-            'avg_cpu_percent': sum(m.cpu_percent for m in recent_metrics) / len(recent_metrics),
-            'avg_memory_mb': sum(m.memory_mb for m in recent_metrics) / len(recent_metrics),
-            'max_active_downloads': max(m.active_downloads for m in recent_metrics),
-            'total_metrics_count': len(recent_metrics)
+            'avg_cpu_percent': sum(m.cpu_percent for m in metrics) / len(metrics),
+            'avg_memory_mb': sum(m.memory_mb for m in metrics) / len(metrics),
+            'max_active_downloads': max(m.active_downloads for m in metrics),
+            'total_metrics_count': len(metrics)
         }
     
     def export_metrics(self, filepath: Path):
         """Exportiert Metriken zu JSON-Datei"""
         try:
-            data = [asdict(metric) for metric in self.metrics_history]
-            
-            # Datetime zu String konvertieren
-            for item in data:
-                item['timestamp'] = item['timestamp'].isoformat()
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # orjson serialisiert Dataclasses und datetime (ISO 8601) direkt,
+            # ohne Zwischen-Dicts pro Eintrag
+            Path(filepath).write_bytes(
+                orjson.dumps(list(self.metrics_history), option=orjson.OPT_INDENT_2)
+            )
                 
             self.logger.info(f"Metriken exportiert zu {filepath}")
             
@@ -127,32 +183,56 @@ class PerformanceMonitor:
 # VIDEO ANALYSIS TOOLS
 # ============================
 
+@lru_cache(maxsize=8192)
+def _parse_url(url: str):
+    """Gecachtes urlparse für wiederkehrende URLs (ParseResult ist unveränderlich)"""
+    return urlparse(url)
+
+
+@lru_cache(maxsize=4096)
+def _extract_domain(netloc: str) -> str:
+    """Entfernt ein führendes 'www.' aus dem Hostnamen"""
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
 class VideoAnalyzer:
     """Analysiert Video-URLs und extrahiert Metadaten"""
     
+    # Geschätzte Erfolgswahrscheinlichkeit je Extraktions-Methode
+    SUCCESS_WEIGHTS = {
+        'direct_download': 0.95,
+        'yt_dlp': 0.85,
+        'browser_automation': 0.60
+    }
+    
     def __init__(self):
         self.logger = structlog.get_logger(__name__ + ".VideoAnalyzer")
         self.video_extensions = {'.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v'}
+        # Tupel für str.endswith, prüft alle Endungen in einem Aufruf
+        self.video_extensions_tuple = tuple(self.video_extensions)
         self.streaming_domains = {
             'youtube.com', 'youtu.be', 'vimeo.com', 'dailymotion.com',
             'twitch.tv', 'facebook.com', 'instagram.com'
         }
+        # Erkennt auch Subdomains wie m.youtube.com oder music.youtube.com
+        self._streaming_suffix_re = re.compile(
+            r'(?:^|\.)(?:' + '|'.join(map(re.escape, self.streaming_domains)) + r')$'
+        )
     
     def analyze_url(self, url: str) -> Dict[str, Any]:
         """Analysiert URL und gibt Informationen zurück"""
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc.lower().replace('www.', '')
+            parsed, domain, is_direct, is_streaming = self._classify(url)
             
             analysis = {
                 'url': url,
                 'domain': domain,
                 'path': parsed.path,
-                'is_direct_video': self._is_direct_video_url(url),
-                'is_streaming_platform': domain in self.streaming_domains,
-                'requires_extraction': not self._is_direct_video_url(url),
-                'estimated_complexity': self._estimate_complexity(url, domain),
-                'suggested_method': self._suggest_extraction_method(url, domain)
+                'is_direct_video': is_direct,
+                'is_streaming_platform': is_streaming,
+                'requires_extraction': not is_direct,
+                'estimated_complexity': self._estimate_complexity(is_direct, is_streaming),
+                'suggested_method': self._suggest_extraction_method(is_direct, is_streaming)
             }
             
             return analysis
@@ -161,80 +241,79 @@ class VideoAnalyzer:
             self.logger.error(f"URL-Analyse fehlgeschlagen für {url}: {e}")
             return {'url': url, 'error': str(e)}
     
-    def _is_direct_video_url(self, url: str) -> bool:
-        """Prüft ob URL direkt auf Video-Datei zeigt"""
-        path = urlparse(url).path.lower()
-        return any(path.endswith(ext) for ext in self.video_extensions)
+    def _classify(self, url: str) -> Tuple[Any, str, bool, bool]:
+        """Zerlegt URL in Parse-Ergebnis, Domain, Direkt-Video- und Streaming-Flag"""
+        parsed = _parse_url(url)
+        domain = _extract_domain(parsed.netloc.lower())
+        return parsed, domain, self._is_direct_video_path(parsed.path), self._is_streaming_domain(domain)
     
-    def _estimate_complexity(self, url: str, domain: str) -> str:
+    def _is_streaming_domain(self, domain: str) -> bool:
+        """Prüft ob Domain (oder eine Subdomain davon) eine Streaming-Plattform ist"""
+        return self._streaming_suffix_re.search(domain) is not None
+    
+    def _is_direct_video_path(self, path: str) -> bool:
+        """Prüft ob URL-Pfad auf eine Video-Datei endet"""
+        return path.lower().endswith(self.video_extensions_tuple)
+    
+    def _estimate_complexity(self, is_direct: bool, is_streaming: bool) -> str:
         """Schätzt Komplexität der Video-Extraktion"""
-        if self._is_direct_video_url(url):
+        if is_direct:
             return 'low'
-        elif domain in self.streaming_domains:
+        elif is_streaming:
             return 'medium'
         else:
             return 'high'
     
-    def _suggest_extraction_method(self, url: str, domain: str) -> str:
+    def _suggest_extraction_method(self, is_direct: bool, is_streaming: bool) -> str:
         """Schlägt Extraktions-Methode vor"""
-        if self._is_direct_video_url(url):
+        if is_direct:
             return 'direct_download'
-        elif domain in self.streaming_domains:
+        elif is_streaming:
             return 'yt_dlp'
         else:
             return 'browser_automation'
     
     def batch_analyze(self, urls: List[str]) -> List[Dict[str, Any]]:
         """Analysiert mehrere URLs gleichzeitig"""
-        results = []
-        for url in urls:
-            analysis = self.analyze_url(url)
-            results.append(analysis)
-        
-        return results
+        analyze_url = self.analyze_url
+        return [analyze_url(url) for url in urls]
     
     def generate_analysis_report(self, analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generiert Zusammenfassungsbericht der Analysen"""
-        total_urls = len(analyses)
-        direct_videos = sum(1 for a in analyses if a.get('is_direct_video', False))
-        streaming_platforms = sum(1 for a in analyses if a.get('is_streaming_platform', False))
-        
-        complexity_distribution = {}
-        method_distribution = {}
+        return self._aggregate(
+            (a.get('is_direct_video', False), a.get('is_streaming_platform', False),
+             a.get('estimated_complexity'), a.get('suggested_method'))
+            for a in analyses
+        )
+    
+    def _aggregate(
+        self, entries: Iterable[Tuple[bool, bool, Optional[str], Optional[str]]]
+    ) -> Dict[str, Any]:
+        """Fasst klassifizierte URLs in einem einzigen Durchlauf zum Bericht zusammen"""
+        complexity_distribution = Counter()
+        method_distribution = Counter()
+        total_urls = direct_videos = streaming_platforms = 0
+        total_weight = 0.0
         
-        for analysis in analyses:
-            complexity = analysis.get('estimated_complexity', 'unknown')
-            method = analysis.get('suggested_method', 'unknown')
-            
-            complexity_distribution[complexity] = complexity_distribution.get(complexity, 0) + 1
-            method_distribution[method] = method_distribution.get(method, 0) + 1
+        for is_direct, is_streaming, complexity, method in entries:
+            total_urls += 1
+            if is_direct:
+                direct_videos += 1
+            if is_streaming:
+                streaming_platforms += 1
+            complexity_distribution[complexity or 'unknown'] += 1
+            method_distribution[method or 'unknown'] += 1
+            # Fehlgeschlagene Analysen zählen wie Browser-Automatisierung
+            total_weight += self.SUCCESS_WEIGHTS.get(method or 'browser_automation', 0.50)
         
         return {
             'total_urls': total_urls,
             'direct_videos': direct_videos,
             'streaming_platforms': streaming_platforms,
-            'complexity_distribution': complexity_distribution,
-            'method_distribution': method_distribution,
-            'success_probability': self._estimate_success_probability(analyses)
+            'complexity_distribution': dict(complexity_distribution),
+            'method_distribution': dict(method_distribution),
+            'success_probability': total_weight / total_urls if total_urls else 0.0
         }
-    
-    def _estimate_success_probability(self, analyses: List[Dict[str, Any]]) -> float:
-        """Schätzt Gesamt-Erfolgswahrscheinlichkeit"""
-        if not analyses:
-            return 0.0
-        
-        success_weights = {
-            'direct_download': 0.95,
-            'yt_dlp': 0.85,
-            'browser_automation': 0.60
-        }
-        
-        total_weight = 0.0
-        for analysis in analyses:
-            method = analysis.get('suggested_method', 'browser_automation')
-            total_weight += success_weights.get(method, 0.50)
-        
-        return total_weight / len(analyses)
 
 
 # ============================
@@ -244,18 +323,49 @@ class VideoAnalyzer:
 class DownloadHistory:
     """Verwaltet Download-Historie in SQLite-Datenbank"""
     
+    # Ab so vielen gelöschten Einträgen wird die Datei per VACUUM verkleinert
+    VACUUM_THRESHOLD = 1000
+    
     def __init__(self, db_path: str = "download_history.db"):
         self.db_path = Path(db_path)
         self.logger = structlog.get_logger(__name__ + ".DownloadHistory")
+        
+        # Eine langlebige Verbindung für alle Operationen (hält auch ':memory:' am Leben),
+        # der Lock serialisiert Zugriffe aus Threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        
         self._init_database()
     
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Liefert die gemeinsame Verbindung exklusiv innerhalb einer Transaktion"""
+        with self._lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """Schließt die Datenbank-Verbindung"""
+        with self._lock:
+            self._conn.close()
+    
     def _init_database(self):
         """Initialisiert SQLite-Datenbank"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                # Wirkt nur bei neu angelegten Datenbanken (vor der ersten Tabelle)
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                
+                # WAL, fsync nur bei Checkpoints, Temp-Tabellen im RAM, ~20 MB Page-Cache
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-20000")
+                conn.execute("PRAGMA busy_timeout=5000")
+                
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS downloads (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        id INTEGER PRIMARY KEY,
                         url TEXT NOT NULL,
                         domain TEXT,
                         title TEXT,
@@ -283,6 +393,74 @@ class DownloadHistory:
                     CREATE INDEX IF NOT EXISTS idx_timestamp ON downloads(timestamp);
                 """)
                 
+                # Deckender Index für die Fehleranalyse in get_download_stats
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_success_ts_err ON downloads(success, timestamp, error_message);
+                """)
+                
+                # Tages-Aggregate je Domain und Erfolg, per Trigger aktuell gehalten
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS downloads_daily_stats (
+                        day TEXT NOT NULL,
+                        domain TEXT NOT NULL,
+                        success INTEGER NOT NULL,
+                        cnt INTEGER NOT NULL DEFAULT 0,
+                        bytes INTEGER NOT NULL DEFAULT 0,
+                        dl_time REAL NOT NULL DEFAULT 0,
+                        dl_time_cnt INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (day, domain, success)
+                    )
+                """)
+                
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_downloads_daily_insert
+                    AFTER INSERT ON downloads
+                    BEGIN
+                        INSERT INTO downloads_daily_stats
+                        (day, domain, success, cnt, bytes, dl_time, dl_time_cnt)
+                        VALUES (date(NEW.timestamp), COALESCE(NEW.domain, ''), COALESCE(NEW.success, 0), 1,
+                                COALESCE(NEW.filesize, 0), COALESCE(NEW.download_time, 0),
+                                NEW.download_time IS NOT NULL)
+                        ON CONFLICT(day, domain, success) DO UPDATE SET
+                            cnt = cnt + 1,
+                            bytes = bytes + excluded.bytes,
+                            dl_time = dl_time + excluded.dl_time,
+                            dl_time_cnt = dl_time_cnt + excluded.dl_time_cnt;
+                    END
+                """)
+                
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS trg_downloads_daily_delete
+                    AFTER DELETE ON downloads
+                    BEGIN
+                        UPDATE downloads_daily_stats SET
+                            cnt = cnt - 1,
+                            bytes = bytes - COALESCE(OLD.filesize, 0),
+                            dl_time = dl_time - COALESCE(OLD.download_time, 0),
+                            dl_time_cnt = dl_time_cnt - (OLD.download_time IS NOT NULL)
+                        WHERE day = date(OLD.timestamp)
+                          AND domain = COALESCE(OLD.domain, '')
+                          AND success = COALESCE(OLD.success, 0);
+                        
+                        DELETE FROM downloads_daily_stats
+                        WHERE day = date(OLD.timestamp)
+                          AND domain = COALESCE(OLD.domain, '')
+                          AND success = COALESCE(OLD.success, 0)
+                          AND cnt <= 0;
+                    END
+                """)
+                
+                # Bestehende Datenbanken einmalig nachtragen
+                conn.execute("""
+                    INSERT INTO downloads_daily_stats
+                    (day, domain, success, cnt, bytes, dl_time, dl_time_cnt)
+                    SELECT date(timestamp), COALESCE(domain, ''), COALESCE(success, 0), COUNT(*),
+                           COALESCE(SUM(filesize), 0), COALESCE(SUM(download_time), 0), COUNT(download_time)
+                    FROM downloads
+                    WHERE NOT EXISTS (SELECT 1 FROM downloads_daily_stats)
+                    GROUP BY 1, 2, 3
+                """)
+                
                 conn.commit()
                 
         except Exception as e:
@@ -300,17 +478,42 @@ class DownloadHistory:
                     ip_address: str = None,
                     user_agent: str = None):
         """Fügt Download-Eintrag zur Historie hinzu"""
+        self.add_many([{
+            'url': url,
+            'success': success,
+            'title': title,
+            'filepath': filepath,
+            'filesize': filesize,
+            'duration': duration,
+            'download_time': download_time,
+            'error_message': error_message,
+            'ip_address': ip_address,
+            'user_agent': user_agent
+        }])
+    
+    def add_many(self, rows: List[Dict[str, Any]]):
+        """Fügt mehrere Download-Einträge (Felder wie add_download) in einer Transaktion hinzu"""
+        if not rows:
+            return
+        
         try:
-            domain = urlparse(url).netloc.replace('www.', '')
+            params = [
+                (row['url'], _extract_domain(_parse_url(row['url']).netloc),
+                 row.get('title'), row.get('filepath'), row.get('filesize'),
+                 row.get('duration'), row.get('download_time'), row['success'],
+                 row.get('error_message'), row.get('ip_address'), row.get('user_agent'))
+                for row in rows
+            ]
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
+            with self._connect() as conn:
+                # Schreibsperre direkt zu Beginn, ein Commit für alle Zeilen
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("""
                     INSERT INTO downloads 
                     (url, domain, title, filepath, filesize, duration, download_time, 
                      success, error_message, ip_address, user_agent)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (url, domain, title, filepath, filesize, duration, download_time,
-                      success, error_message, ip_address, user_agent))
+                """, params)
                 
                 conn.commit()
                 
@@ -318,34 +521,34 @@ class DownloadHistory:
             self.logger.error(f"Fehler beim Hinzufügen zur Download-Historie: {e}")
     
     def get_download_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Erstellt Download-Statistiken der letzten N Tage"""
+        """Erstellt Download-Statistiken der letzten N Tage (ganze UTC-Tage ab dem Stichtag)"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
+            # Alle Abfragen nutzen dieselbe Tagesgrenze wie die Tages-Aggregate;
+            # Zeitstempel werden von SQLite in UTC gespeichert
+            cutoff_day = (datetime.now(timezone.utc) - timedelta(days=days)).date().isoformat()
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                
-                # Gesamt-Statistiken
+            with self._connect() as conn:
+                # Gesamt-Statistiken aus den Tages-Aggregaten
                 total_result = conn.execute("""
                     SELECT 
-                        COUNT(*) as total_downloads,
-                        SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful,
-                        SUM(CASE WHEN success = 0 THEN 1 ELSE 0 END) as failed,
-                        AVG(download_time) as avg_download_time,
-                        SUM(filesize) as total_filesize
-                    FROM downloads 
-                    WHERE timestamp >= ?
-                """, (cutoff_date,)).fetchone()
+                        COALESCE(SUM(cnt), 0) as total_downloads,
+                        COALESCE(SUM(CASE WHEN success = 1 THEN cnt END), 0) as successful,
+                        COALESCE(SUM(CASE WHEN success = 0 THEN cnt END), 0) as failed,
+                        SUM(dl_time) / NULLIF(SUM(dl_time_cnt), 0) as avg_download_time,
+                        SUM(bytes) as total_filesize
+                    FROM downloads_daily_stats 
+                    WHERE day >= ?
+                """, (cutoff_day,)).fetchone()
                 
                 # Top-Domains
                 domain_results = conn.execute("""
-                    SELECT domain, COUNT(*) as count
-                    FROM downloads 
-                    WHERE timestamp >= ?
+                    SELECT domain, SUM(cnt) as count
+                    FROM downloads_daily_stats 
+                    WHERE day >= ?
                     GROUP BY domain
                     ORDER BY count DESC
                     LIMIT 10
-                """, (cutoff_date,)).fetchall()
+                """, (cutoff_day,)).fetchall()
                 
                 # Fehler-Analyse
                 error_results = conn.execute("""
@@ -355,7 +558,7 @@ class DownloadHistory:
                     GROUP BY error_message
                     ORDER BY count DESC
                     LIMIT 5
-                """, (cutoff_date,)).fetchall()
+                """, (cutoff_day,)).fetchall()
                 
                 return {
                     'period_days': days,
@@ -378,7 +581,7 @@ class DownloadHistory:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 result = conn.execute("""
                     DELETE FROM downloads 
                     WHERE timestamp < ?
@@ -387,6 +590,16 @@ class DownloadHistory:
                 deleted_count = result.rowcount
                 conn.commit()
                 
+                if deleted_count >= self.VACUUM_THRESHOLD:
+                    conn.execute("VACUUM")
+                elif deleted_count:
+                    # executescript läuft bis zum Ende; execute gäbe nur eine Seite frei
+                    conn.executescript("PRAGMA incremental_vacuum(1000)")
+                
+                if deleted_count:
+                    # WAL-Datei nach dem Löschen zurücksetzen statt wachsen zu lassen
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                
                 self.logger.info(f"{deleted_count} alte Einträge bereinigt")
                 
         except Exception as e:
@@ -400,23 +613,26 @@ class DownloadHistory:
 class RichDisplay:
     """Verbesserte Console-Ausgabe mit Rich"""
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console: Optional["Console"] = None):
+        if console is None:
+            from rich.console import Console
+            console = Console()
+        self.console = console
     
     def display_analysis_results(self, analyses: List[Dict[str, Any]]):
         """Zeigt URL-Analyse-Ergebnisse in einer Tabelle"""
+        from rich.table import Table
+        
         table = Table(title="URL-Analyse Ergebnisse")
         
-        table.add_column("URL", style="cyan", no_wrap=True, max_width=40)
+        # Rich kürzt lange URLs selbst auf die Spaltenbreite
+        table.add_column("URL", style="cyan", no_wrap=True, max_width=40, overflow="ellipsis")
         table.add_column("Domain", style="magenta")
         table.add_column("Typ", style="green")
         table.add_column("Komplexität", style="yellow")
         table.add_column("Methode", style="blue")
         
         for analysis in analyses:
-            url = analysis.get('url', 'N/A')
-            domain = analysis.get('domain', 'N/A')
-            
             video_type = "Direkt" if analysis.get('is_direct_video') else "Extraction"
             if analysis.get('is_streaming_platform'):
                 video_type = "Streaming"
@@ -424,13 +640,15 @@ class RichDisplay:
             complexity = analysis.get('estimated_complexity', 'Unknown').title()
             method = analysis.get('suggested_method', 'Unknown').replace('_', ' ').title()
             
-            table.add_row(url[:37] + "..." if len(url) > 40 else url, 
-                         domain, video_type, complexity, method)
+            table.add_row(analysis.get('url', 'N/A'), analysis.get('domain', 'N/A'),
+                          video_type, complexity, method)
         
         self.console.print(table)
     
     def display_download_stats(self, stats: Dict[str, Any]):
         """Zeigt Download-Statistiken"""
+        from rich.table import Table
+        
         table = Table(title=f"Download-Statistiken ({stats.get('period_days', 'N/A')} Tage)")
         
         table.add_column("Metrik", style="cyan")
@@ -464,7 +682,8 @@ class RichDisplay:
         
         self.console.print(f"\n[bold green]✅ Erfolgreich: {successful}[/bold green]")
         self.console.print(f"[bold red]❌ Fehlgeschlagen: {failed}[/bold red]")
-        self.console.print(f"[bold blue]📊 Erfolgsrate: {successful/len(results)*100:.1f}%[/bold blue]")
+        success_rate = successful / len(results) * 100 if results else 0.0
+        self.console.print(f"[bold blue]📊 Erfolgsrate: {success_rate:.1f}%[/bold blue]")
 
 
 # ============================
@@ -484,13 +703,23 @@ class ErrorRecovery:
             'rate_limited': ['rate limit', '429', 'too many requests'],
             'login_required': ['login', 'authentication', 'unauthorized']
         }
+        
+        # Alle Muster in einem Regex, die Gruppe benennt die Kategorie
+        self._error_re = re.compile(
+            '|'.join(
+                f"(?P<{category}>{'|'.join(map(re.escape, patterns))})"
+                for category, patterns in self.error_patterns.items()
+            ),
+            re.IGNORECASE
+        )
     
     def categorize_error(self, error_message: str) -> str:
         """Kategorisiert Fehler basierend auf Nachrichten"""
-        error_lower = error_message.lower()
+        matched = {match.lastgroup for match in self._error_re.finditer(error_message)}
         
-        for category, patterns in self.error_patterns.items():
-            if any(pattern in error_lower for pattern in patterns):
+        # Reihenfolge der Kategorien bestimmt die Priorität
+        for category in self.error_patterns:
+            if category in matched:
                 return category
         
         return 'unknown'
@@ -5,23 +5,28 @@ Entwickelt für den sicheren Download von Videos mit NordVPN IP-Rotation
 """
 
 import asyncio
-import json
+import atexit
+import copy
 import logging
 import os
+import queue
 import random
 import re
-import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
-import yt_dlp
+import orjson
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser, Page, Playwright
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 from pydantic import BaseModel, Field, validator
 
 
@@ -41,6 +46,7 @@ class SiteConfig(BaseModel):
     login_password_field: str = "input[name='password'], input[type='password']"
     login_submit_button: str = "button[type='submit'], input[type='submit']"
     wait_after_login: int = 3
+    session_ttl: int = 86400  # Gültigkeit gespeicherter Login-Cookies in Sekunden
     custom_headers: Dict[str, str] = Field(default_factory=dict)
     human_delay_min: float = 1.0
     human_delay_max: float = 3.0
@@ -57,6 +63,7 @@ class GlobalConfig(BaseModel):
     
     sites: Dict[str, SiteConfig] = Field(default_factory=dict)
     output_directory: str = "./downloads"
+    session_state_dir: str = "./.session_state"  # Login-Cookies pro Domain
     nordvpn_enabled: bool = True
     ip_rotation_interval_min: int = 300  # 5 Minuten
     ip_rotation_interval_max: int = 1800  # 30 Minuten
@@ -72,6 +79,69 @@ class GlobalConfig(BaseModel):
     log_level: str = "INFO"
 
 
+@lru_cache(maxsize=8)
+def _read_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Liest und parst eine Konfigurationsdatei (gecacht pro Pfad, Änderungszeit und Größe)"""
+    return orjson.loads(Path(path).read_bytes())
+
+
+@lru_cache(maxsize=8)
+def _read_global_config(path: str, mtime_ns: int, size: int) -> GlobalConfig:
+    """Validiert eine Konfigurationsdatei zu GlobalConfig (Cache-Schlüssel wie _read_config)"""
+    # Pydantic parst die Bytes direkt, ohne Umweg über ein Python-Dict
+    return GlobalConfig.model_validate_json(Path(path).read_bytes())
+
+
+def _config_key(path: Path) -> Tuple[str, int, int]:
+    """Cache-Schlüssel einer Konfigurationsdatei: (Pfad, mtime_ns, Größe)"""
+    st = path.stat()
+    return str(path.resolve()), st.st_mtime_ns, st.st_size
+
+
+def load_config(path: Union[str, Path]) -> Dict[str, Any]:
+    """Lädt eine JSON-Konfiguration, bei unveränderter Datei aus dem Cache"""
+    # Kopie zurückgeben, damit Aufrufer den gecachten Eintrag nicht verändern
+    return copy.deepcopy(_read_config(*_config_key(Path(path))))
+
+
+def load_global_config(path: Union[str, Path]) -> GlobalConfig:
+    """Lädt und validiert eine Konfiguration, bei unveränderter Datei ohne erneute Validierung"""
+    return _read_global_config(*_config_key(Path(path))).model_copy(deep=True)
+
+
+# Init-Script für jeden Browser-Kontext, einmal pro Kontext registriert
+_STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined,
+    });
+"""
+
+# Prozessweiter Listener für das Logging, siehe WebVideoDownloader._setup_logging
+_log_listener: Optional[QueueListener] = None
+
+
+@lru_cache(maxsize=8192)
+def _url_domain(url: str) -> str:
+    """Domain einer URL ohne 'www.' (gecacht, dieselbe URL wird mehrfach zerlegt)"""
+    netloc = urlparse(url).netloc
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _atomic_write_bytes(path: Path, data: bytes, mode: Optional[int] = None):
+    """Schreibt Daten atomar: temporäre Datei neben dem Ziel, dann ersetzen"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if mode is None:
+        tmp_path.write_bytes(data)
+    else:
+        # Zugriffsrechte schon beim Anlegen der Datei setzen, nicht erst danach
+        tmp_path.unlink(missing_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
 # ============================
 # DATA CLASSES
 # ============================
@@ -108,10 +178,15 @@ class DownloadResult:
 class VPNManager:
     """Manager für NordVPN-Verbindungen und IP-Rotation"""
     
-    def __init__(self, enabled: bool = True):
+    def __init__(self, enabled: bool = True, session: Optional[aiohttp.ClientSession] = None,
+                 ip_cache_ttl: float = 60.0):
         self.enabled = enabled
         self.current_server: Optional[str] = None
         self.last_rotation = datetime.now()
+        self.session = session  # Optional geteilte Session (Connection-Pool, Keep-Alive)
+        self._own_session: Optional[aiohttp.ClientSession] = None  # Lazy angelegt, falls keine geteilt wird
+        self.ip_cache_ttl = ip_cache_ttl
+        self._ip_cache: Optional[Tuple[str, float]] = None  # (IP, monotonic-Zeitstempel)
         self.logger = logging.getLogger(__name__ + ".VPNManager")
         
     async def connect_to_random_server(self) -> bool:
@@ -126,34 +201,50 @@ class VPNManager:
             country = random.choice(countries)
             
             # Verbindung herstellen
-            cmd = f"nordvpn connect {country}"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
+            returncode, stderr = await self._run_nordvpn("connect", country, timeout=30)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 self.current_server = country
                 self.last_rotation = datetime.now()
+                self._ip_cache = None
                 self.logger.info(f"VPN verbunden mit {country}")
                 await asyncio.sleep(random.uniform(2, 5))  # Kurze Pause nach Verbindung
                 return True
             else:
-                self.logger.error(f"VPN-Verbindung fehlgeschlagen: {result.stderr}")
+                self.logger.error(f"VPN-Verbindung fehlgeschlagen: {stderr}")
                 return False
                 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             self.logger.error("VPN-Verbindung Timeout")
             return False
         except Exception as e:
             self.logger.error(f"VPN-Fehler: {e}")
             return False
     
+    async def _run_nordvpn(self, *args: str, timeout: float) -> Tuple[int, str]:
+        """Führt das nordvpn-CLI ohne Shell aus und liefert (Returncode, stderr)"""
+        proc = await asyncio.create_subprocess_exec(
+            "nordvpn", *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        return proc.returncode, stderr.decode(errors="replace")
+    
     async def disconnect(self) -> bool:
         """Trennt die VPN-Verbindung"""
         if not self.enabled:
             return True
             
         try:
-            result = subprocess.run("nordvpn disconnect", shell=True, capture_output=True, text=True, timeout=15)
-            if result.returncode == 0:
+            returncode, _ = await self._run_nordvpn("disconnect", timeout=15)
+            self._ip_cache = None
+            if returncode == 0:
                 self.logger.info("VPN getrennt")
                 return True
             return False
@@ -178,16 +269,42 @@ class VPNManager:
         return True
     
     async def get_current_ip(self) -> Optional[str]:
-        """Ermittelt die aktuelle öffentliche IP-Adresse"""
+        """Ermittelt die aktuelle öffentliche IP-Adresse (gecacht bis zur nächsten Rotation)"""
+        if self._ip_cache and time.monotonic() - self._ip_cache[1] < self.ip_cache_ttl:
+            return self._ip_cache[0]
+        
+        timeout = aiohttp.ClientTimeout(total=10)
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.get("https://httpbin.org/ip") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get("origin")
+            if self.session is not None and not self.session.closed:
+                session = self.session
+            else:
+                # Eigene Session einmal anlegen und für weitere Abfragen offen halten
+                if self._own_session is None or self._own_session.closed:
+                    self._own_session = aiohttp.ClientSession(timeout=timeout)
+                session = self._own_session
+            
+            ip = await self._fetch_ip(session, timeout)
+            if ip:
+                self._ip_cache = (ip, time.monotonic())
+            return ip
         except Exception as e:
             self.logger.error(f"IP-Abfrage fehlgeschlagen: {e}")
         return None
+    
+    async def aclose(self):
+        """Schließt die eigene HTTP-Session (eine geteilte Session bleibt offen)"""
+        if self._own_session is not None and not self._own_session.closed:
+            await self._own_session.close()
+        self._own_session = None
+    
+    async def _fetch_ip(self, session: aiohttp.ClientSession,
+                        timeout: aiohttp.ClientTimeout) -> Optional[str]:
+        """Fragt IP-Echo-Service über die übergebene Session ab"""
+        async with session.get("https://httpbin.org/ip", timeout=timeout) as response:
+            if response.status == 200:
+                data = await response.json()
+                return data.get("origin")
+        return None
 
 
 # ============================
@@ -259,19 +376,61 @@ class HumanBehaviorSimulator:
 class VideoExtractor:
     """Extrahiert und downloadet Videos mit yt-dlp"""
     
-    def __init__(self, output_dir: str):
+    # Optionen für reine Info-Abfragen ohne Download
+    INFO_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'extractaudio': False,
+        'skip_download': True,
+    }
+    
+    # Endungen, an denen heruntergeladene Videodateien erkannt werden
+    VIDEO_SUFFIXES = frozenset({'.mp4', '.mkv', '.webm', '.avi'})
+    
+    # Muster für Dateinamen, einmalig kompiliert
+    _unsafe_chars_re = re.compile(r'[^\w\s-]')
+    _dash_re = re.compile(r'[-\s]+')
+    
+    def __init__(self, output_dir: str, max_workers: int = 3):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(__name__ + ".VideoExtractor")
+        
+        # Eigener Pool für yt-dlp, getrennt vom Default-Executor der Event-Loop
+        # Mindestens ein Worker, auch wenn concurrent_downloads auf 0 steht
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='ytdl')
+        
+        # YoutubeDL ist nicht threadsicher, daher eine Instanz pro Executor-Thread
+        self._info_local = threading.local()
+        self._info_instances: List[Any] = []
+    
+    def _get_info_ydl(self):
+        """Liefert die wiederverwendbare YoutubeDL-Instanz des aktuellen Threads"""
+        ydl = getattr(self._info_local, 'ydl', None)
+        if ydl is None:
+            import yt_dlp  # erst bei Bedarf laden, der Import ist teuer
+            
+            ydl = yt_dlp.YoutubeDL(self.INFO_OPTS)
+            self._info_local.ydl = ydl
+            self._info_instances.append(ydl)
+        return ydl
+    
+    def close(self):
+        """Schließt den Thread-Pool und danach alle wiederverwendeten YoutubeDL-Instanzen"""
+        # Erst laufende Aufrufe abwarten, sonst würde ihr YoutubeDL unter ihnen geschlossen
+        self._executor.shutdown(wait=True)
+        for ydl in self._info_instances:
+            ydl.close()
+        self._info_instances.clear()
+        self._info_local = threading.local()
     
     def _get_safe_filename(self, url: str, title: str = "") -> str:
         """Erstellt einen sicheren Dateinamen basierend auf URL"""
-        domain = urlparse(url).netloc.replace("www.", "")
+        domain = _url_domain(url)
         
         if title:
             # Bereinige Titel für Dateinamen
-            safe_title = re.sub(r'[^\w\s-]', '', title).strip()
-            safe_title = re.sub(r'[-\s]+', '-', safe_title)
+            safe_title = self._dash_re.sub('-', self._unsafe_chars_re.sub('', title).strip())
             filename = f"{domain}_{safe_title}"
         else:
             # Fallback auf URL-basierte Benennung
@@ -282,33 +441,42 @@ class VideoExtractor:
     async def extract_video_info(self, url: str) -> Optional[VideoInfo]:
         """Extrahiert Video-Informationen ohne Download"""
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extractaudio': False,
-                'skip_download': True,
-            }
+            info = await asyncio.get_event_loop().run_in_executor(
+                self._executor, lambda: self._get_info_ydl().extract_info(url, download=False)
+            )
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: ydl.extract_info(url, download=False)
+            if info:
+                return VideoInfo(
+                    url=url,
+                    title=info.get('title', ''),
+                    duration=info.get('duration'),
+                    format_id=info.get('format_id'),
+                    filesize=info.get('filesize'),
+                    quality=info.get('height', 'unknown'),
+                    direct_url=info.get('url')
                 )
-                
-                if info:
-                    return VideoInfo(
-                        url=url,
-                        title=info.get('title', ''),
-                        duration=info.get('duration'),
-                        format_id=info.get('format_id'),
-                        filesize=info.get('filesize'),
-                        quality=info.get('height', 'unknown'),
-                        direct_url=info.get('url')
-                    )
         except Exception as e:
             self.logger.error(f"Video-Info-Extraktion fehlgeschlagen für {url}: {e}")
         
         return None
     
+    @staticmethod
+    def _run_download(ydl_opts: Dict[str, Any], url: str) -> int:
+        """Erstellt eine YoutubeDL-Instanz mit den Download-Optionen und lädt die URL"""
+        import yt_dlp
+        
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            return ydl.download([url])
+    
+    def _find_video_file(self, filename: str) -> Optional[Path]:
+        """Sucht die Videodatei zu einem Dateinamen mit einem Verzeichnisdurchlauf"""
+        prefix = f"{filename}."
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and os.path.splitext(entry.name)[1] in self.VIDEO_SUFFIXES:
+                    return Path(entry.path)
+        return None
+    
     async def download_video(self, url: str, custom_filename: str = None) -> DownloadResult:
         """Downloadet Video in bester verfügbarer Qualität"""
         start_time = time.time()
@@ -339,24 +507,22 @@ class VideoExtractor:
                 'keepvideo': True,
             }
             
-            # Download ausführen
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: ydl.download([url])
-                )
+            # Download ausführen, YoutubeDL wird im Worker-Thread aufgebaut
+            await asyncio.get_event_loop().run_in_executor(
+                self._executor, self._run_download, ydl_opts, url
+            )
             
             # Erfolgreich heruntergeladene Datei finden
-            downloaded_files = list(self.output_dir.glob(f"{filename}.*"))
-            video_files = [f for f in downloaded_files if f.suffix in ['.mp4', '.mkv', '.webm', '.avi']]
+            video_file = self._find_video_file(filename)
             
-            if video_files:
+            if video_file:
                 download_time = time.time() - start_time
-                self.logger.info(f"Video erfolgreich heruntergeladen: {video_files[0]}")
+                self.logger.info(f"Video erfolgreich heruntergeladen: {video_file}")
                 
                 return DownloadResult(
                     url=url,
                     success=True,
-                    filepath=video_files[0],
+                    filepath=video_file,
                     video_info=video_info,
                     download_time=download_time
                 )
@@ -376,15 +542,38 @@ class VideoExtractor:
 class WebVideoDownloader:
     """Hauptklasse für den Web Video Downloader"""
     
-    def __init__(self, config_path: str = "config.json"):
-        self.config_path = Path(config_path)
-        self.config = self._load_config()
-        self.vpn_manager = VPNManager(enabled=self.config.nordvpn_enabled)
-        self.video_extractor = VideoExtractor(self.config.output_directory)
+    # Seiten pro Browser-Kontext, bevor er neu angelegt wird (begrenzt Speicherwachstum)
+    CONTEXT_RECYCLE_PAGES = 50
+    
+    # Bilder und Fonts auf Netzwerkebene verwerfen; nur passende URLs laufen über Python
+    _blocked_resource_re = re.compile(
+        r"\.(?:png|jpe?g|gif|webp|avif|svg|ico|woff2?|ttf|otf)(?:[?#]|$)", re.IGNORECASE
+    )
+    
+    def __init__(self, config: Union[str, Path, Dict[str, Any], GlobalConfig] = "config.json",
+                 session: Optional[aiohttp.ClientSession] = None):
+        # Dateipfad wird geladen, Dict/GlobalConfig wird ohne Datei-I/O übernommen
+        self.config_path: Optional[Path] = None
+        if isinstance(config, GlobalConfig):
+            self.config = config
+        elif isinstance(config, dict):
+            self.config = GlobalConfig(**config)
+        else:
+            self.config_path = Path(config)
+            self.config = self._load_config()
+        self.session = session
+        self.vpn_manager = VPNManager(enabled=self.config.nordvpn_enabled, session=session)
+        self.video_extractor = VideoExtractor(self.config.output_directory,
+                                              max_workers=self.config.concurrent_downloads)
         self.human_behavior = HumanBehaviorSimulator()
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
-        self.session_cookies: Dict[str, List] = {}
+        self.session_cookies: Dict[str, Tuple[List, float]] = {}  # Domain -> (Cookies, Speicherzeit)
+        
+        # Ein wiederverwendeter Kontext pro User-Agent, samt Seitenzähler
+        self._contexts: Dict[str, BrowserContext] = {}
+        self._context_pages: Dict[str, int] = {}
+        self._context_lock: Optional[asyncio.Lock] = None
         
         # Logging konfigurieren
         self._setup_logging()
@@ -401,9 +590,7 @@ class WebVideoDownloader:
     def _load_config(self) -> GlobalConfig:
         """Lädt Konfiguration aus JSON-Datei"""
         if self.config_path.exists():
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                return GlobalConfig(**config_data)
+            return load_global_config(self.config_path)
         else:
             # Standard-Konfiguration erstellen
             default_config = GlobalConfig()
@@ -412,20 +599,34 @@ class WebVideoDownloader:
     
     def _save_config(self, config: GlobalConfig):
         """Speichert Konfiguration in JSON-Datei"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(config.dict(), f, indent=2, ensure_ascii=False)
+        data = orjson.dumps(config.model_dump(mode='json'), option=orjson.OPT_INDENT_2)
+        _atomic_write_bytes(self.config_path, data)
     
     def _setup_logging(self):
-        """Konfiguriert das Logging-System"""
-        log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        logging.basicConfig(
-            level=getattr(logging, self.config.log_level),
-            format=log_format,
-            handlers=[
-                logging.FileHandler('video_downloader.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        """Konfiguriert das Logging-System (Ausgabe in einem Hintergrund-Thread)"""
+        global _log_listener
+        
+        root = logging.getLogger()
+        if root.handlers:
+            return  # wie basicConfig: bestehende Konfiguration nicht überschreiben
+        
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        handlers = [
+            RotatingFileHandler('video_downloader.log', maxBytes=10_000_000, backupCount=3,
+                                encoding='utf-8', delay=True),
+            logging.StreamHandler()
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        # Aufrufer legen Records nur in die Queue, Formatieren und Schreiben übernimmt der Listener
+        log_queue = queue.SimpleQueue()
+        _log_listener = QueueListener(log_queue, *handlers)
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+        
+        root.addHandler(QueueHandler(log_queue))
+        root.setLevel(getattr(logging, self.config.log_level))
     
     async def __aenter__(self):
         """Async Context Manager Entry"""
@@ -453,53 +654,152 @@ class WebVideoDownloader:
             headless=self.config.headless,
             args=browser_args
         )
+        # Lock erst hier anlegen, damit er an die laufende Event-Loop gebunden ist
+        self._context_lock = asyncio.Lock()
         
         self.logger.info("Browser gestartet")
     
-    async def cleanup(self):
-        """Bereinigt Ressourcen"""
+    async def _close_browser(self):
+        """Schließt Browser und Playwright"""
         if self.browser:
-            await self.browser.close()
+            await self.browser.close()  # schließt auch alle Kontexte
+        self._contexts.clear()
+        self._context_pages.clear()
         if self.playwright:
             await self.playwright.stop()
-        await self.vpn_manager.disconnect()
+    
+    async def cleanup(self):
+        """Bereinigt Ressourcen"""
+        # Browser-Shutdown und VPN-Trennung sind unabhängig und laufen parallel
+        await asyncio.gather(self._close_browser(), self.vpn_manager.disconnect())
+        await self.vpn_manager.aclose()
+        # close() wartet auf laufende yt-dlp-Aufrufe, daher nicht auf der Event-Loop
+        await asyncio.to_thread(self.video_extractor.close)
         
         self.logger.info("Cleanup abgeschlossen")
     
     def _get_site_config(self, url: str) -> Optional[SiteConfig]:
         """Ermittelt Site-Konfiguration für URL"""
-        domain = urlparse(url).netloc.replace("www.", "")
+        domain = _url_domain(url)
         return self.config.sites.get(domain)
     
+    async def _get_context(self, user_agent: str) -> BrowserContext:
+        """Liefert den Browser-Kontext eines User-Agents; Aufrufer hält _context_lock"""
+        context = self._contexts.get(user_agent)
+        
+        # Verbrauchten Kontext erst erneuern, wenn keine seiner Seiten mehr offen ist
+        if (context is not None and not context.pages
+                and self._context_pages[user_agent] >= self.CONTEXT_RECYCLE_PAGES):
+            await context.close()
+            context = None
+        
+        if context is None:
+            context = await self.browser.new_context(
+                user_agent=user_agent,
+                viewport={'width': 1920, 'height': 1080},
+                java_script_enabled=True,
+                ignore_https_errors=True
+            )
+            
+            # Erweiterte Stealth-Konfiguration, gilt für alle Seiten des Kontexts
+            await context.add_init_script(_STEALTH_SCRIPT)
+            await context.route(self._blocked_resource_re, self._abort_route)
+            
+            self._contexts[user_agent] = context
+            self._context_pages[user_agent] = 0
+        
+        return context
+    
+    @staticmethod
+    async def _abort_route(route):
+        """Bricht eine abgefangene Anfrage ab"""
+        await route.abort()
+    
     async def _create_page(self) -> Page:
         """Erstellt neue Browser-Seite mit zufälligem User-Agent"""
         user_agent = random.choice(self.config.user_agents)
         
-        context = await self.browser.new_context(
-            user_agent=user_agent,
-            viewport={'width': 1920, 'height': 1080},
-            java_script_enabled=True,
-            ignore_https_errors=True
-        )
+        # Seite unter dem Lock öffnen, sonst könnte ein paralleler Aufruf den Kontext
+        # recyceln, solange context.pages die neue Seite noch nicht enthält
+        async with self._context_lock:
+            context = await self._get_context(user_agent)
+            page = await context.new_page()
+            self._context_pages[user_agent] += 1
+        return page
+    
+    def _session_state_path(self, domain: str) -> Path:
+        """Pfad der gespeicherten Login-Cookies einer Domain"""
+        return Path(self.config.session_state_dir) / f"{domain}.json"
+    
+    async def _restore_session(self, page: Page, domain: str, site_config: SiteConfig) -> bool:
+        """Übernimmt gespeicherte Login-Cookies, solange sie jünger als session_ttl sind"""
+        cached = self.session_cookies.get(domain)
+        if cached is None:
+            state_path = self._session_state_path(domain)
+            try:
+                saved_at = state_path.stat().st_mtime
+                cached = (orjson.loads(state_path.read_bytes()), saved_at)
+            except (OSError, orjson.JSONDecodeError):
+                return False
         
-        page = await context.new_page()
+        # Gleiche Gültigkeitsprüfung für Cookies aus dem Speicher und aus der Datei
+        cookies, saved_at = cached
+        if time.time() - saved_at > site_config.session_ttl:
+            return False
         
-        # Erweiterte Stealth-Konfiguration
-        await page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined,
-            });
-        """)
+        await page.context.add_cookies(cookies)
+        self.session_cookies[domain] = cached
+        return True
+    
+    def _drop_session(self, domain: str):
+        """Verwirft die gespeicherte Sitzung einer Domain im Speicher und auf der Platte"""
+        self.session_cookies.pop(domain, None)
+        try:
+            self._session_state_path(domain).unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning(f"Sitzung für {domain} konnte nicht gelöscht werden: {e}")
+    
+    async def _save_session(self, page: Page, domain: str, urls: List[str]):
+        """Speichert die Login-Cookies der angegebenen URLs für spätere Läufe"""
+        cookies = await page.context.cookies(urls)
+        self.session_cookies[domain] = (cookies, time.time())
         
-        return page
+        state_path = self._session_state_path(domain)
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Sitzungs-Cookies nur für den Besitzer lesbar
+            _atomic_write_bytes(state_path, orjson.dumps(cookies), mode=0o600)
+        except OSError as e:
+            self.logger.warning(f"Sitzung für {domain} konnte nicht gespeichert werden: {e}")
     
     async def _handle_login(self, page: Page, site_config: SiteConfig) -> bool:
         """Führt automatisches Login durch wenn konfiguriert"""
         if not (site_config.login_username and site_config.login_password):
             return True
         
+        login_url = site_config.login_url or page.url
+        domain = _url_domain(login_url)
+        
         try:
-            login_url = site_config.login_url or page.url
+            # Gültige Sitzung aus einem früheren Login wiederverwenden
+            if await self._restore_session(page, domain, site_config):
+                if page.url == "about:blank":
+                    await page.goto(login_url)
+                    redirected = False
+                else:
+                    on_login_page = page.url.startswith(login_url)
+                    await page.reload()
+                    redirected = not on_login_page and page.url.startswith(login_url)
+                
+                # Server kann die Sitzung vor Ablauf von session_ttl verworfen haben
+                login_form = page.locator(site_config.login_username_field).first
+                if redirected or await login_form.is_visible():
+                    self.logger.info(f"Gespeicherte Sitzung für {domain} abgelaufen, neues Login")
+                    self._drop_session(domain)
+                else:
+                    self.logger.info(f"Gespeicherte Sitzung für {domain} übernommen")
+                    return True
+            
             if page.url != login_url:
                 await page.goto(login_url)
                 await self.human_behavior.random_delay()
@@ -518,7 +818,9 @@ class WebVideoDownloader:
             # Warten nach Login
             await asyncio.sleep(site_config.wait_after_login)
             
-            self.logger.info(f"Login erfolgreich für {urlparse(page.url).netloc}")
+            await self._save_session(page, domain, [login_url, page.url])
+            
+            self.logger.info(f"Login erfolgreich für {domain}")
             return True
             
         except Exception as e: